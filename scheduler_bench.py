@@ -0,0 +1,134 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from itertools import product
+
+import numpy as np
+
+from scheduler_core import ALGORITHMS, ProcessTable, RunProfile, schedule
+
+def make_workload(n, burst_scale=10, load=0.9, seed=0):
+    # Exponential bursts with mean burst_scale and Poisson arrivals spaced so
+    # that the offered load (mean burst / mean inter-arrival gap) is `load`.
+    rng = np.random.default_rng(seed)
+    bt = 1 + rng.exponential(burst_scale, n).astype(np.int64)
+    gaps = rng.exponential((burst_scale + 1) / load, n)
+    gaps[:1] = 0
+    at = np.floor(np.cumsum(gaps)).astype(np.int64)
+    return ProcessTable(np.arange(1, n + 1), at, bt, rng.integers(1, 11, n))
+
+def _fresh(table):
+    return ProcessTable(table['PID'], table['AT'], table['BT'], table['Priority'])
+
+def bench_one(table, algorithm, quantum, repeat=1, measure_memory=True):
+    # Best-of-repeat wall time, then one extra traced run for peak memory so
+    # tracemalloc overhead never leaks into the timing.
+    best = float('inf')
+    for _ in range(repeat):
+        run = _fresh(table)
+        start = time.perf_counter()
+        schedule(algorithm, run, quantum=quantum)
+        best = min(best, time.perf_counter() - start)
+    peak = None
+    if measure_memory:
+        run = _fresh(table)
+        tracemalloc.start()
+        schedule(algorithm, run, quantum=quantum)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    # Dispatch decisions come from a profiled run of their own, since the
+    # preemptive gantt merges back-to-back dispatches of one process.
+    profile = RunProfile()
+    schedule(algorithm, _fresh(table), quantum=quantum, profile=profile)
+    decisions = profile.decisions
+    return {
+        'wall_time': best,
+        'peak_memory': peak,
+        'decisions': decisions,
+        'decisions_per_sec': decisions / best if best > 0 else None,
+    }
+
+def run_suite(sizes, burst_scales, loads, quanta, algorithms, seed=0, repeat=1, measure_memory=True,
+              log=None):
+    results = []
+    for n, burst_scale, load in product(sizes, burst_scales, loads):
+        table = make_workload(n, burst_scale, load, seed)
+        for algorithm in algorithms:
+            for quantum in (quanta if algorithm == 'round_robin' else [None]):
+                case = {'algorithm': algorithm, 'quantum': quantum, 'n': n,
+                        'burst_scale': burst_scale, 'load': load}
+                case.update(bench_one(table, algorithm, quantum or 2, repeat, measure_memory))
+                results.append(case)
+                if log:
+                    log(case)
+    return results
+
+def _case_key(case):
+    return (case['algorithm'], case['quantum'], case['n'], case['burst_scale'], case['load'])
+
+def find_regressions(results, baseline, threshold=0.2, min_time=1e-3):
+    # A case regresses when its wall time is more than `threshold` (as a
+    # fraction) slower than the same case in the baseline. Cases under
+    # min_time seconds are timer noise and never count.
+    previous = {_case_key(case): case for case in baseline['results']}
+    regressions = []
+    for case in results:
+        old = previous.get(_case_key(case))
+        if old and case['wall_time'] >= min_time and case['wall_time'] > old['wall_time'] * (1 + threshold):
+            regressions.append((case, old))
+    return regressions
+
+def _format_case(case):
+    quantum = f" q={case['quantum']}" if case['quantum'] is not None else ''
+    memory = f"{case['peak_memory'] / 2**20:9.1f} MiB" if case['peak_memory'] is not None else '        - MiB'
+    rate = case['decisions_per_sec'] or 0
+    return (f"{case['algorithm'] + quantum:28} n={case['n']:<8} bt~{case['burst_scale']:<6} "
+            f"load={case['load']:<5} {case['wall_time']:9.4f} s {memory} {rate:12.0f} decisions/s")
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Benchmark the scheduling algorithms on seeded synthetic workloads.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000, 10000],
+                        help="process counts to run (up to 1000000)")
+    parser.add_argument('--burst-scales', type=float, nargs='+', default=[10, 1000],
+                        help="mean burst times")
+    parser.add_argument('--loads', type=float, nargs='+', default=[0.9],
+                        help="arrival density as offered load; above 1 the ready queue keeps growing")
+    parser.add_argument('--quanta', type=int, nargs='+', default=[4], help="Round Robin quanta")
+    parser.add_argument('-a', '--algorithms', nargs='+', choices=list(ALGORITHMS), default=list(ALGORITHMS))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3, help="report the best of this many runs")
+    parser.add_argument('--no-memory', action='store_true', help="skip the traced peak-memory run")
+    parser.add_argument('-o', '--output', help="write the results as JSON to this file")
+    parser.add_argument('--baseline', help="JSON results from an earlier run to compare against")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="allowed slowdown over the baseline as a fraction (default 0.2)")
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    results = run_suite(args.sizes, args.burst_scales, args.loads, args.quanta, args.algorithms,
+                        seed=args.seed, repeat=args.repeat, measure_memory=not args.no_memory,
+                        log=lambda case: print(_format_case(case), flush=True))
+    report = {
+        'meta': {'python': platform.python_version(), 'numpy': np.__version__,
+                 'platform': platform.platform(), 'seed': args.seed},
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = find_regressions(results, baseline, args.threshold)
+        for case, old in regressions:
+            print(f"REGRESSION {_format_case(case)} (baseline {old['wall_time']:.4f} s)")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.threshold:.0%} of the baseline.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict, namedtuple
+
+import numpy as np
+
+from scheduler_core import ALGORITHMS, ProcessTable, schedule
+
+CachedResult = namedtuple('CachedResult', 'st ct gantt')
+
+def _nbytes(entry):
+    return entry.st.nbytes + entry.ct.nbytes + entry.gantt.nbytes
+
+class ResultCache:
+    # Results keyed on a hash of the workload columns, the algorithm name and
+    # its parameters. Entries live in an in-memory LRU bounded by count and
+    # bytes; with a directory they are also written there as .npz files and
+    # found again after a restart.
+    def __init__(self, max_entries=128, max_bytes=256 * 2**20, directory=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.directory = directory
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(table, algorithm, quantum=2, **params):
+        params = {'quantum': quantum} if algorithm == 'round_robin' else params
+        h = hashlib.sha256(json.dumps({'algorithm': algorithm, 'params': params,
+                                       'priority': table.has_priority, 'n': len(table)},
+                                      sort_keys=True).encode())
+        for name in ProcessTable.INPUT_COLUMNS:
+            h.update(np.ascontiguousarray(table[name], dtype='<i8').data)
+        return h.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + '.npz')
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+        if self.directory and os.path.exists(self._path(key)):
+            with np.load(self._path(key)) as data:
+                entry = CachedResult(data['st'], data['ct'], data['gantt'])
+            with self._lock:
+                self.disk_hits += 1
+            self._remember(key, entry)
+            return entry
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def _remember(self, key, entry):
+        size = _nbytes(entry)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= _nbytes(self._entries.pop(key))
+            self._entries[key] = entry
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= _nbytes(evicted)
+                self.evictions += 1
+
+    def put(self, key, entry):
+        self._remember(key, entry)
+        if self.directory:
+            # Write to a temporary name first so a crash never leaves a
+            # truncated entry behind.
+            tmp = self._path(key) + '.tmp'
+            with open(tmp, 'wb') as f:
+                np.savez(f, st=entry.st, ct=entry.ct, gantt=entry.gantt)
+            os.replace(tmp, self._path(key))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {'hits': self.hits, 'disk_hits': self.disk_hits, 'misses': self.misses,
+                    'evictions': self.evictions, 'entries': len(self._entries), 'bytes': self._bytes}
+
+    def schedule(self, algorithm, processes, quantum=2, progress=None, simulate=None, profile=None, **params):
+        # Drop-in for scheduler_core.schedule(). Dict lists get their results
+        # written back in input order. On a miss, simulate(table, progress,
+        # profile) runs instead of schedule() if given, e.g.
+        # IncrementalScheduler.run. A hit only bumps profile.cache_hits.
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm {algorithm!r}, expected one of {', '.join(ALGORITHMS)}")
+        table = processes if isinstance(processes, ProcessTable) else ProcessTable.from_dicts(processes)
+        key = self.key(table, algorithm, quantum, **params)
+        entry = self.get(key)
+        if entry is None:
+            if simulate is None:
+                table, gantt = schedule(algorithm, table, quantum=quantum, progress=progress,
+                                        profile=profile, **params)
+            else:
+                table, gantt = simulate(table, progress, profile)
+            self.put(key, CachedResult(table['ST'].copy(), table['CT'].copy(),
+                                       np.array(gantt, dtype=np.int64).reshape(-1, 3)))
+        else:
+            if profile is not None:
+                profile.cache_hits += 1
+            table['ST'] = entry.st
+            table['CT'] = entry.ct
+            table.compute_metrics()
+            gantt = list(map(tuple, entry.gantt.tolist()))
+        if not isinstance(processes, ProcessTable):
+            table.update_dicts(processes)
+            return processes, gantt
+        return table, gantt
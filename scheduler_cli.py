@@ -0,0 +1,268 @@
+import argparse
+import sys
+from contextlib import ExitStack
+from itertools import chain
+
+from scheduler_cache import ResultCache
+from scheduler_core import (
+    AGING_CAP, AGING_INTERVAL, ALGORITHMS, BALANCERS, CFS_LATENCY, CFS_MIN_GRANULARITY, MLFQ_BOOST, MLFQ_QUANTA,
+    RUN_QUEUES, Completion, ProcessTable, RunProfile, StreamingSummary, fcfs, multicore_schedule, schedule,
+    stream_schedule, summarize, summarize_cores
+)
+from scheduler_compare import compare, sweep_quantum
+from scheduler_io import (
+    FORMATS, detect_format, read_tables, write_completions, write_core_gantt, write_core_utilization, write_gantt,
+    write_results, write_summaries
+)
+from scheduler_trace import TraceReader, TraceWriter, schedule_to_trace
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Run a CPU scheduling algorithm over a CSV/JSONL workload without the GUI.")
+    parser.add_argument('inputs', nargs='*', default=['-'],
+                        help="workload files with PID, AT, BT and optional Priority columns ('-' for stdin)")
+    parser.add_argument('-a', '--algorithm', choices=list(ALGORITHMS), default='fcfs')
+    parser.add_argument('-q', '--quantum', type=int, default=2, help="time quantum for round_robin")
+    parser.add_argument('--latency', type=int, default=CFS_LATENCY, help="scheduling period for cfs")
+    parser.add_argument('--min-granularity', type=int, default=CFS_MIN_GRANULARITY,
+                        help="shortest slice cfs hands out")
+    parser.add_argument('--quanta', type=int, nargs='+', default=list(MLFQ_QUANTA),
+                        help="per-level quanta for mlfq, highest level first")
+    parser.add_argument('--boost', type=int, default=MLFQ_BOOST,
+                        help="mlfq priority boost period (0 disables it)")
+    parser.add_argument('--aging-interval', type=int, default=AGING_INTERVAL,
+                        help="time priority_aging waits per priority level gained")
+    parser.add_argument('--aging-cap', type=int, default=AGING_CAP,
+                        help="most priority levels priority_aging lets a process gain")
+    parser.add_argument('--no-preempt', action='store_true',
+                        help="let priority_aging run each process to completion")
+    parser.add_argument('--cores', type=int, default=1,
+                        help="simulate this many identical CPUs (fcfs, sjf, srtf, priority and round_robin); "
+                             "--gantt then gets a Core column")
+    parser.add_argument('--queues', choices=RUN_QUEUES, default='global',
+                        help="one ready queue shared by all cores, or one per core")
+    parser.add_argument('--balance', choices=BALANCERS, default='least_loaded',
+                        help="how arrivals are spread over per-core queues")
+    parser.add_argument('--no-steal', action='store_true',
+                        help="keep idle cores from taking work queued on other cores")
+    parser.add_argument('--core-utilization',
+                        help="where to write each core's share of the makespan spent running, with --cores")
+    parser.add_argument('--input-format', choices=FORMATS,
+                        help="defaults to the file extension, or csv for stdin")
+    parser.add_argument('--output-format', choices=FORMATS, default='csv')
+    parser.add_argument('--metrics', default='-', help="where to write per-process metrics ('-' for stdout)")
+    parser.add_argument('--gantt', help="where to write gantt segments ('-' for stdout)")
+    parser.add_argument('--summary',
+                        help="where to write one row of latency percentiles, throughput, CPU utilization, "
+                             "context switches and fairness ('-' for stdout); percentiles are estimates "
+                             "within 1%% with --stream")
+    parser.add_argument('--chunk-size', type=int, default=100000, help="rows read per chunk")
+    parser.add_argument('--cache-dir',
+                        help="reuse results of identical earlier runs stored in this directory")
+    parser.add_argument('--stream', action='store_true',
+                        help="schedule AT-sorted input online, holding only unfinished processes in memory; "
+                             "metrics are written in completion order")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--compare', action='store_true',
+                      help="run every algorithm in parallel and write one summary row per algorithm")
+    mode.add_argument('--sweep', type=int, nargs='+', metavar='QUANTUM',
+                      help="run round_robin once per quantum in parallel and write one summary row each")
+    parser.add_argument('-j', '--jobs', type=int, help="worker processes for --compare/--sweep")
+    parser.add_argument('--profile', action='store_true',
+                        help="print run counters and per-phase wall times to stderr")
+    parser.add_argument('--trace',
+                        help="also save segments and results to this binary trace file; the gantt is "
+                             "then never held in memory (bypasses --cache-dir)")
+    return parser
+
+def _algorithm_params(args):
+    if args.algorithm == 'cfs':
+        return {'latency': args.latency, 'min_granularity': args.min_granularity}
+    if args.algorithm == 'mlfq':
+        return {'quanta': tuple(args.quanta), 'boost': args.boost}
+    if args.algorithm == 'priority_aging':
+        return {'aging_interval': args.aging_interval, 'aging_cap': args.aging_cap,
+                'preemptive': not args.no_preempt}
+    return {}
+
+def _open_output(stack, path):
+    if path is None:
+        return None
+    if path == '-':
+        return sys.stdout
+    return stack.enter_context(open(path, 'w', newline=''))
+
+def _input_tables(stack, args):
+    for path in args.inputs:
+        if path == '-':
+            stream = sys.stdin
+        else:
+            stream = stack.enter_context(open(path, newline=''))
+        fmt = args.input_format or detect_format(path)
+        yield from read_tables(stream, fmt, args.chunk_size)
+
+def _stream_fcfs(tables, metrics_out, gantt_out, fmt, profile=None, trace=None, summary=None):
+    # FCFS never looks ahead, so arrival-ordered input can be scheduled one
+    # chunk at a time with only the CPU free time carried over.
+    time = 0
+    last_at = None
+    first = True
+    for table in tables:
+        if not len(table):
+            continue
+        if last_at is not None and table['AT'].min() < last_at:
+            raise ValueError("FCFS streams its input chunk by chunk, so the workload must be sorted by AT")
+        table, gantt = fcfs(table, start=time, profile=profile)
+        time = int(table['CT'].max())
+        last_at = int(table['AT'].max())
+        if metrics_out:
+            write_results(metrics_out, table, fmt, header=first)
+        if gantt_out:
+            write_gantt(gantt_out, gantt, fmt, header=first)
+        if trace:
+            trace.has_priority = trace.has_priority or table.has_priority
+            trace.add_segments(gantt)
+            trace.add_results(table)
+        if summary:
+            summary.add_table(table)
+            summary.add_segments(gantt)
+        first = False
+
+def _stream_online(tables, args, metrics_out, gantt_out, profile=None, trace=None, summary=None):
+    # Any policy can run online over arrival-ordered input. Segments and
+    # completion records are written out in blocks as they become final.
+    tables = iter(tables)
+    first = next(tables, None)
+    has_priority = first is not None and first.has_priority
+    arrivals = (row for table in chain([first] if first else [], tables)
+                for row in table.rows(ProcessTable.INPUT_COLUMNS))
+    segments, completions = [], []
+    headers = {'gantt': True, 'metrics': True}
+    if trace:
+        trace.has_priority = has_priority
+
+    def flush():
+        if trace:
+            trace.add_segments(segments)
+            for completion in completions:
+                trace.add_completion(completion)
+        if summary:
+            summary.add_completions(completions)
+            summary.add_segments(segments)
+        if gantt_out:
+            write_gantt(gantt_out, segments, args.output_format, header=headers['gantt'])
+            headers['gantt'] = False
+        if metrics_out:
+            write_completions(metrics_out, completions, args.output_format, header=headers['metrics'],
+                              has_priority=has_priority)
+            headers['metrics'] = False
+        segments.clear()
+        completions.clear()
+
+    if profile is not None:
+        profile.start()
+    for event in stream_schedule(args.algorithm, arrivals, args.quantum, profile=profile,
+                                 **_algorithm_params(args)):
+        if event.__class__ is Completion:
+            completions.append(event)
+        else:
+            segments.append(event)
+        if len(segments) + len(completions) >= args.chunk_size:
+            flush()
+    flush()
+    if profile is not None:
+        # Reading and writing happen inside the loop here, so they are
+        # included in its time.
+        profile.lap('main_loop')
+
+def _write_trace_gantt(stream, path, fmt, chunk_size):
+    gantt = TraceReader(path).gantt
+    for i in range(0, max(len(gantt), 1), chunk_size):
+        write_gantt(stream, gantt[i:i + chunk_size].tolist(), fmt, header=i == 0)
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.quantum < 1 or min(args.sweep or [1]) < 1:
+        sys.exit("error: the Round Robin quantum must be at least 1")
+    if (args.profile or args.trace) and (args.compare or args.sweep):
+        sys.exit("error: --profile and --trace cover a single run and cannot be combined with --compare or --sweep")
+    if args.summary and (args.compare or args.sweep):
+        sys.exit("error: --compare and --sweep already write summary rows to --metrics")
+    if args.cores < 1:
+        sys.exit("error: --cores must be at least 1")
+    if args.cores > 1 and (args.compare or args.sweep or args.stream or args.trace or args.cache_dir):
+        sys.exit("error: --cores cannot be combined with --compare, --sweep, --stream, --trace or --cache-dir")
+    if args.core_utilization and args.cores == 1:
+        sys.exit("error: --core-utilization needs --cores above 1")
+    profile = RunProfile() if args.profile else None
+    with ExitStack() as stack:
+        metrics_out = _open_output(stack, args.metrics)
+        gantt_out = _open_output(stack, args.gantt)
+        summary_out = _open_output(stack, args.summary)
+        utilization_out = _open_output(stack, args.core_utilization)
+        tables = _input_tables(stack, args)
+        try:
+            if args.compare or args.sweep:
+                table = ProcessTable.concat(tables)
+                if args.compare:
+                    summaries = compare(table, quantum=args.quantum, max_workers=args.jobs)
+                else:
+                    summaries = sweep_quantum(table, args.sweep, max_workers=args.jobs)
+                write_summaries(metrics_out, summaries, args.output_format)
+                return
+            params = _algorithm_params(args)
+            if args.cores > 1:
+                table, lanes = multicore_schedule(args.algorithm, ProcessTable.concat(tables), args.cores,
+                                                  args.quantum, profile=profile, queues=args.queues,
+                                                  balance=args.balance, steal=not args.no_steal)
+                if metrics_out:
+                    write_results(metrics_out, table, args.output_format)
+                if gantt_out:
+                    write_core_gantt(gantt_out, lanes, args.output_format)
+                summary = summarize_cores(table, lanes) if summary_out or utilization_out else None
+                if utilization_out:
+                    write_core_utilization(utilization_out, summary['CoreUtilization'], args.output_format)
+            elif args.stream or (args.algorithm == 'fcfs' and not summary_out):
+                # FCFS is scheduled chunk by chunk even without --stream,
+                # unless a summary is wanted: its percentiles are exact
+                # only when the whole table is held.
+                trace = None
+                if args.trace:
+                    header = {'quantum': args.quantum} if args.algorithm == 'round_robin' else params
+                    trace = stack.enter_context(TraceWriter(args.trace, args.algorithm, header))
+                streaming = StreamingSummary() if summary_out else None
+                if args.algorithm == 'fcfs':
+                    _stream_fcfs(tables, metrics_out, gantt_out, args.output_format, profile, trace, streaming)
+                else:
+                    _stream_online(tables, args, metrics_out, gantt_out, profile, trace, streaming)
+                summary = streaming.summary() if streaming else None
+            elif args.trace:
+                table = schedule_to_trace(args.trace, args.algorithm, ProcessTable.concat(tables),
+                                          quantum=args.quantum, profile=profile, **params)
+                if metrics_out:
+                    write_results(metrics_out, table, args.output_format)
+                if gantt_out:
+                    _write_trace_gantt(gantt_out, args.trace, args.output_format, args.chunk_size)
+                summary = summarize(table, TraceReader(args.trace).gantt) if summary_out else None
+            else:
+                run = ResultCache(directory=args.cache_dir).schedule if args.cache_dir else schedule
+                table, gantt = run(args.algorithm, ProcessTable.concat(tables), quantum=args.quantum,
+                                   profile=profile, **params)
+                if metrics_out:
+                    write_results(metrics_out, table, args.output_format)
+                if gantt_out:
+                    write_gantt(gantt_out, gantt, args.output_format)
+                summary = summarize(table, gantt) if summary_out else None
+            if summary_out:
+                summary.update(Algorithm=args.algorithm,
+                               Quantum=args.quantum if args.algorithm == 'round_robin' else None)
+                write_summaries(summary_out, [summary], args.output_format)
+        except KeyError as e:
+            sys.exit(f"error: missing column {e}")
+        except ValueError as e:
+            sys.exit(f"error: {e}")
+    if profile is not None:
+        print(profile.format(), file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
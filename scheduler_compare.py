@@ -0,0 +1,57 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from scheduler_core import ALGORITHMS, ProcessTable, schedule, summarize
+
+# The workload is copied into one shared memory block and every worker maps
+# it once in its initializer, so a task only pickles (algorithm, quantum).
+_SHARED_COLUMNS = ('PID', 'AT', 'BT', 'Priority')
+_worker_shm = None
+_worker_columns = None
+_worker_has_priority = False
+
+def _attach_workload(name, n, has_priority):
+    global _worker_shm, _worker_columns, _worker_has_priority
+    _worker_shm = shared_memory.SharedMemory(name=name)
+    _worker_columns = np.ndarray((len(_SHARED_COLUMNS), n), dtype=np.int64, buffer=_worker_shm.buf)
+    _worker_has_priority = has_priority
+
+def _run_shared(algorithm, quantum):
+    # The input columns are read-only views of shared memory; only the
+    # result columns are allocated per run.
+    table = ProcessTable(*_worker_columns[:3], _worker_columns[3] if _worker_has_priority else None)
+    table, gantt = schedule(algorithm, table, quantum=quantum)
+    summary = {'Algorithm': algorithm, 'Quantum': quantum if algorithm == 'round_robin' else None}
+    summary.update(summarize(table, gantt))
+    return summary
+
+def run_parallel(processes, runs, max_workers=None):
+    # runs is a list of (algorithm, quantum) pairs; one summary row comes
+    # back per run, in the same order.
+    table = processes if isinstance(processes, ProcessTable) else ProcessTable.from_dicts(processes)
+    for algorithm, _ in runs:
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm {algorithm!r}, expected one of {', '.join(ALGORITHMS)}")
+    n = len(table)
+    shm = shared_memory.SharedMemory(create=True, size=max(1, len(_SHARED_COLUMNS) * n * 8))
+    columns = np.ndarray((len(_SHARED_COLUMNS), n), dtype=np.int64, buffer=shm.buf)
+    try:
+        for row, name in enumerate(_SHARED_COLUMNS):
+            columns[row] = table[name]
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_attach_workload,
+                                 initargs=(shm.name, n, table.has_priority)) as pool:
+            futures = [pool.submit(_run_shared, algorithm, quantum) for algorithm, quantum in runs]
+            return [f.result() for f in futures]
+    finally:
+        del columns
+        shm.close()
+        shm.unlink()
+
+def compare(processes, algorithms=None, quantum=2, max_workers=None):
+    algorithms = algorithms or list(ALGORITHMS)
+    return run_parallel(processes, [(algorithm, quantum) for algorithm in algorithms], max_workers)
+
+def sweep_quantum(processes, quanta, max_workers=None):
+    return run_parallel(processes, [('round_robin', q) for q in quanta], max_workers)
@@ -0,0 +1,1427 @@
+from bisect import bisect_left
+from collections import deque, namedtuple
+import heapq
+from itertools import chain
+from time import perf_counter
+import numpy as np
+
+# -------------------- Process Table --------------------
+
+class ProcessTable:
+    # Struct-of-arrays process store: one NumPy column per field instead of
+    # one dict per process. The algorithms fill ST and CT; TAT, WT and RT are
+    # derived from them in compute_metrics().
+    INPUT_COLUMNS = ('PID', 'AT', 'BT', 'Priority')
+    RESULT_COLUMNS = ('ST', 'CT', 'TAT', 'WT', 'RT')
+
+    def __init__(self, pid, at, bt, priority=None):
+        self.columns = {
+            'PID': np.asarray(pid, dtype=np.int64),
+            'AT': np.asarray(at, dtype=np.int64),
+            'BT': np.asarray(bt, dtype=np.int64),
+        }
+        n = len(self.columns['PID'])
+        self.has_priority = priority is not None
+        self.columns['Priority'] = (np.asarray(priority, dtype=np.int64) if self.has_priority
+                                    else np.zeros(n, dtype=np.int64))
+        for name in self.RESULT_COLUMNS:
+            self.columns[name] = np.zeros(n, dtype=np.int64)
+
+    @classmethod
+    def concat(cls, tables):
+        tables = list(tables)
+        priority = None
+        if any(t.has_priority for t in tables):
+            priority = np.concatenate([t['Priority'] for t in tables])
+        return cls(*(np.concatenate([t[name] for t in tables] or [[]]) for name in ('PID', 'AT', 'BT')),
+                   priority)
+
+    @classmethod
+    def from_dicts(cls, processes):
+        priority = None
+        if any('Priority' in p for p in processes):
+            priority = [p.get('Priority', 0) for p in processes]
+        return cls([p['PID'] for p in processes], [p['AT'] for p in processes],
+                   [p['BT'] for p in processes], priority)
+
+    def __len__(self):
+        return len(self.columns['PID'])
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __setitem__(self, name, values):
+        self.columns[name][:] = values
+
+    def compute_metrics(self):
+        np.subtract(self['CT'], self['AT'], out=self['TAT'])
+        np.subtract(self['TAT'], self['BT'], out=self['WT'])
+        np.subtract(self['ST'], self['AT'], out=self['RT'])
+
+    def output_columns(self):
+        names = list(self.INPUT_COLUMNS if self.has_priority else self.INPUT_COLUMNS[:-1])
+        return names + list(self.RESULT_COLUMNS)
+
+    def rows(self, names=None):
+        names = names or self.output_columns()
+        return zip(*(self[name].tolist() for name in names))
+
+    def to_dicts(self):
+        names = self.output_columns()
+        return [dict(zip(names, row)) for row in self.rows(names)]
+
+    def update_dicts(self, processes):
+        for p, row in zip(processes, self.rows(self.RESULT_COLUMNS)):
+            p.update(zip(self.RESULT_COLUMNS, row))
+
+def _run_on_table(algorithm, processes, *args, profile=None):
+    # The algorithms work on a ProcessTable; plain dict lists are converted
+    # on the way in and get their results written back on the way out.
+    if profile is not None:
+        profile.start()
+    table = processes if isinstance(processes, ProcessTable) else ProcessTable.from_dicts(processes)
+    gantt = algorithm(table, *args, profile=profile)
+    table.compute_metrics()
+    if profile is not None:
+        profile.lap('metrics')
+    if table is not processes:
+        table.update_dicts(processes)
+    if profile is not None:
+        profile.lap('merge')
+        profile.context_switches += context_switches(gantt)
+    return processes, gantt
+
+# -------------------- Scheduling Algorithms --------------------
+
+# The event loops call progress(time) with the simulated time reached once
+# every PROGRESS_EVERY dispatches. The callback may raise SchedulingCancelled
+# to abort the run.
+PROGRESS_EVERY = 4096
+
+class SchedulingCancelled(Exception):
+    pass
+
+class RunProfile:
+    # Opt-in instrumentation: pass profile=RunProfile() to schedule() or any
+    # algorithm function. Counters add up over every run it is passed to.
+    # Without one the algorithms measure nothing.
+    PHASES = ('setup', 'main_loop', 'metrics', 'merge')
+
+    def __init__(self):
+        self.simulated_ticks = 0
+        self.idle_ticks_skipped = 0
+        self.decisions = 0
+        self.queue_ops = 0
+        self.context_switches = 0
+        self.cache_hits = 0
+        self.phase_seconds = dict.fromkeys(self.PHASES, 0.0)
+        self._mark = 0.0
+
+    def start(self):
+        self._mark = perf_counter()
+
+    def lap(self, phase):
+        # Charges the wall time since the last start() or lap() to phase.
+        now = perf_counter()
+        self.phase_seconds[phase] += now - self._mark
+        self._mark = now
+
+    def add_engine_stats(self, stats):
+        self.simulated_ticks += stats.end - stats.start
+        self.idle_ticks_skipped += stats.idle
+        self.decisions += stats.decisions
+        self.queue_ops += stats.queue_ops
+
+    def track(self, events, switches=False):
+        # Passes an engine's events through and records the EngineStats it
+        # returns. With switches, PID changes between segments are counted
+        # on the way, for runs whose whole gantt is never collected.
+        if not switches:
+            self.add_engine_stats((yield from events))
+            return
+        last = None
+        while True:
+            try:
+                event = next(events)
+            except StopIteration as stop:
+                self.add_engine_stats(stop.value)
+                return
+            if event.__class__ is tuple:
+                if last is not None and event[0] != last:
+                    self.context_switches += 1
+                last = event[0]
+            yield event
+
+    def as_dict(self):
+        d = {'SimulatedTicks': self.simulated_ticks, 'IdleTicksSkipped': self.idle_ticks_skipped,
+             'Decisions': self.decisions, 'QueueOps': self.queue_ops,
+             'ContextSwitches': self.context_switches, 'CacheHits': self.cache_hits}
+        for phase in self.PHASES:
+            d[phase.title().replace('_', '') + 'Seconds'] = self.phase_seconds[phase]
+        return d
+
+    def format(self):
+        lines = [f"{'Simulated ticks':20} {self.simulated_ticks}",
+                 f"{'Idle ticks skipped':20} {self.idle_ticks_skipped}",
+                 f"{'Decisions':20} {self.decisions}",
+                 f"{'Ready-queue ops':20} {self.queue_ops}",
+                 f"{'Context switches':20} {self.context_switches}"]
+        if self.cache_hits:
+            lines.append(f"{'Cache hits':20} {self.cache_hits}")
+        lines += [f"{phase.replace('_', ' ').capitalize():20} {self.phase_seconds[phase] * 1000:.3f} ms"
+                  for phase in self.PHASES]
+        return '\n'.join(lines)
+
+def _fcfs_finish_times(at, bt, start=0):
+    # CT[k] = max(CT[k-1], AT[k]) + BT[k] unrolls to a running maximum over
+    # the cumulative burst time, so the whole schedule is a few array ops.
+    done = np.cumsum(bt)
+    return done + np.maximum(np.maximum.accumulate(at - (done - bt)), start)
+
+def _fcfs(table, start=0, profile=None):
+    order = np.argsort(table['AT'], kind='stable')
+    bt = table['BT'][order]
+    if profile is not None:
+        profile.lap('setup')
+    ct = _fcfs_finish_times(table['AT'][order], bt, start)
+    st = ct - bt
+    if profile is not None:
+        profile.lap('main_loop')
+        # There is no ready queue; every process is one decision.
+        end = int(ct[-1]) if len(ct) else start
+        profile.simulated_ticks += end - start
+        profile.idle_ticks_skipped += end - start - int(bt.sum())
+        profile.decisions += len(ct)
+    table['CT'][order] = ct
+    table['ST'][order] = st
+    gantt = list(zip(table['PID'][order].tolist(), st.tolist(), ct.tolist()))
+    if profile is not None:
+        profile.lap('merge')
+    return gantt
+
+def fcfs(processes, start=0, profile=None):
+    # start is the time the CPU becomes free, so a long arrival-ordered
+    # workload can be scheduled chunk by chunk.
+    processes, gantt = _run_on_table(_fcfs, processes, start, profile=profile)
+    if not isinstance(processes, ProcessTable):
+        processes = sorted(processes, key=lambda p: p['AT'])
+    return processes, gantt
+
+def estimate_makespan(table, cores=1):
+    # Every policy here keeps the CPU busy whenever something is ready, so
+    # they all finish exactly when FCFS does. For several cores this is a
+    # rough guess: one CPU that works `cores` times as fast.
+    if not len(table):
+        return 0
+    order = np.argsort(table['AT'], kind='stable')
+    bt = table['BT'][order]
+    return int(np.ceil(_fcfs_finish_times(table['AT'][order], bt if cores == 1 else bt / cores)[-1]))
+
+class Completion(namedtuple('Completion', 'Seq PID AT BT Priority ST CT')):
+    # Emitted by the engines once a process has finished. Seq is the
+    # process's position in the arrival stream.
+    __slots__ = ()
+
+    @property
+    def TAT(self):
+        return self.CT - self.AT
+
+    @property
+    def WT(self):
+        return self.CT - self.AT - self.BT
+
+    @property
+    def RT(self):
+        return self.ST - self.AT
+
+def _checked_arrivals(arrivals):
+    # Arrivals are (PID, AT, BT, Priority) tuples or process dicts, in AT
+    # order; the engines only ever look one arrival ahead.
+    last_at = None
+    for p in arrivals:
+        if isinstance(p, dict):
+            p = (p['PID'], p['AT'], p['BT'], p.get('Priority', 0))
+        if last_at is not None and p[1] < last_at:
+            raise ValueError(f"Arrivals must be in AT order, got AT {p[1]} after {last_at}")
+        last_at = p[1]
+        yield p
+
+# The engines below are generators over an arrival iterator. They yield
+# (pid, start, end) gantt segments and Completion records as soon as those
+# are final, and only hold the processes that have arrived but not finished.
+# Ties on the ranking key go to the earlier arrival, which for arrival-sorted
+# input is the original (AT, input index) order.
+#
+# When an engine runs out of work it returns an EngineStats (the generator's
+# StopIteration value) built from counters the loop keeps anyway.
+#
+# With checkpoint_every set, an engine also yields a Checkpoint after every
+# that many dispatches. Passing one back as `resume`, together with the
+# arrivals from position Checkpoint.seq on, continues the run from there.
+
+class EngineStats(namedtuple('EngineStats', 'start end idle decisions queue_ops')):
+    # start and end are the simulated times the run covered; idle is the
+    # part of that the CPU had nothing ready and the engine jumped over.
+    __slots__ = ()
+
+class Checkpoint(namedtuple('Checkpoint', 'time seq steps ready extra')):
+    # Engine state between two dispatches: the simulated time, how many
+    # arrivals have been admitted, the dispatch count and a copy of the
+    # ready queue. extra is whatever else the engine carries over, such as
+    # the (pid, start) segment the preemptive engine has not closed yet.
+    __slots__ = ()
+
+def _non_preemptive_engine(arrivals, rank_field=None, progress=None, checkpoint_every=0, resume=None):
+    # rank_field indexes the arrival tuple (2 = BT, 3 = Priority); None keeps
+    # arrival order. An idle CPU jumps straight to the next arrival.
+    arrivals = iter(arrivals)
+    pending = next(arrivals, None)
+    if resume is None:
+        seq, time, completed, ready = 0, 0, 0, []
+    else:
+        # Heap entries are immutable tuples, so a shallow copy will do.
+        seq, time, completed, ready = resume.seq, resume.time, resume.steps, list(resume.ready)
+    time0, seq0, steps0, idle = time, seq, completed, 0
+
+    while True:
+        while pending is not None and pending[1] <= time:
+            heapq.heappush(ready, (0 if rank_field is None else pending[rank_field], seq, pending))
+            seq += 1
+            pending = next(arrivals, None)
+        if not ready:
+            if pending is None:
+                # One push per arrival and one pop per dispatch.
+                return EngineStats(time0, time, idle, completed - steps0, seq - seq0 + completed - steps0)
+            idle += pending[1] - time
+            time = pending[1]
+            continue
+        _, position, (pid, at, bt, priority) = heapq.heappop(ready)
+        yield (pid, time, time + bt)
+        yield Completion(position, pid, at, bt, priority, time, time + bt)
+        time += bt
+        completed +=1
+        if progress is not None and completed % PROGRESS_EVERY == 0:
+            progress(time)
+        if checkpoint_every and completed % checkpoint_every == 0:
+            yield Checkpoint(time, seq, completed, list(ready), None)
+
+def _requeue_ops(decisions, ready0):
+    # Engines that put an unfinished process back pop once per dispatch and
+    # push once per dispatch, less the processes already queued at the start.
+    return 2 * decisions - ready0
+
+def _preemptive_engine(arrivals, by_priority=False, progress=None, checkpoint_every=0, resume=None):
+    # Event-driven: the running process only changes on an arrival or a
+    # completion, so jump straight between those instead of ticking. The
+    # heap is keyed on priority, or on remaining time for SRTF. A gantt
+    # segment stays open until a different PID is dispatched, so idle gaps
+    # are absorbed into the segment before them.
+    arrivals = iter(arrivals)
+    pending = next(arrivals, None)
+    if resume is None:
+        seq, time, steps, ready = 0, 0, 0, []
+        open_pid, open_start = None, 0
+    else:
+        seq, time, steps = resume.seq, resume.time, resume.steps
+        ready = [(rank, position, proc[:]) for rank, position, proc in resume.ready]
+        open_pid, open_start = resume.extra
+    time0, steps0, ready0, idle = time, steps, len(ready), 0
+
+    while True:
+        while pending is not None and pending[1] <= time:
+            pid, at, bt, priority = pending
+            heapq.heappush(ready, (priority if by_priority else bt, seq, [pid, at, bt, priority, bt, None]))
+            seq += 1
+            pending = next(arrivals, None)
+        if not ready:
+            if pending is None:
+                break
+            idle += pending[1] - time
+            time = pending[1]
+            continue
+        rank, position, proc = heapq.heappop(ready)
+        if proc[5] is None:
+            proc[5] = time
+        if open_pid != proc[0]:
+            if open_pid is not None:
+                yield (open_pid, open_start, time)
+            open_pid, open_start = proc[0], time
+        run = proc[4]
+        if pending is not None:
+            run = min(run, pending[1] - time)
+        proc[4] -= run
+        time += run
+        steps += 1
+        if progress is not None and steps % PROGRESS_EVERY == 0:
+            progress(time)
+        if proc[4] == 0:
+            yield Completion(position, proc[0], proc[1], proc[2], proc[3], proc[5], time)
+        else:
+            heapq.heappush(ready, (rank if by_priority else proc[4], position, proc))
+        if checkpoint_every and steps % checkpoint_every == 0:
+            yield Checkpoint(time, seq, steps, [(r, s, p[:]) for r, s, p in ready], (open_pid, open_start))
+
+    if open_pid is not None:
+        yield (open_pid, open_start, time)
+    return EngineStats(time0, time, idle, steps - steps0, _requeue_ops(steps - steps0, ready0))
+
+def _round_robin_engine(arrivals, quantum, progress=None, checkpoint_every=0, resume=None):
+    arrivals = iter(arrivals)
+    pending = next(arrivals, None)
+    if resume is None:
+        seq, time, steps, queue = 0, 0, 0, deque()
+    else:
+        seq, time, steps = resume.seq, resume.time, resume.steps
+        queue = deque(proc[:] for proc in resume.ready)
+    time0, steps0, ready0, idle = time, steps, len(queue), 0
+
+    while True:
+        # Everything that arrived up to now joins the queue before the
+        # process that was just preempted is put back.
+        while pending is not None and pending[1] <= time:
+            queue.append([*pending, pending[2], None, seq])
+            seq += 1
+            pending = next(arrivals, None)
+        if not queue:
+            if pending is None:
+                return EngineStats(time0, time, idle, steps - steps0, _requeue_ops(steps - steps0, ready0))
+            idle += pending[1] - time
+            time = pending[1]
+            continue
+        proc = queue.popleft()
+        if proc[5] is None:
+            proc[5] = time
+        exec_time = min(quantum, proc[4])
+        yield (proc[0], time, time + exec_time)
+        time += exec_time
+        proc[4] -= exec_time
+        steps += 1
+        if progress is not None and steps % PROGRESS_EVERY == 0:
+            progress(time)
+
+        while pending is not None and pending[1] <= time:
+            queue.append([*pending, pending[2], None, seq])
+            seq += 1
+            pending = next(arrivals, None)
+
+        if proc[4] == 0:
+            yield Completion(proc[6], proc[0], proc[1], proc[2], proc[3], proc[5], time)
+        else:
+            queue.append(proc)
+        if checkpoint_every and steps % checkpoint_every == 0:
+            yield Checkpoint(time, seq, steps, [p[:] for p in queue], None)
+
+# Linux's sched_prio_to_weight table: the load weight of nice -20 to 19.
+# Each nice level is worth about 10% CPU time against its neighbour.
+NICE_0_WEIGHT = 1024
+CFS_WEIGHTS = (
+    88761, 71755, 56483, 46273, 36291, 29154, 23254, 18705, 14949, 11916,
+    9548, 7620, 6100, 4904, 3906, 3121, 2501, 1991, 1586, 1277,
+    1024, 820, 655, 526, 423, 335, 272, 215, 172, 137,
+    110, 87, 70, 56, 45, 36, 29, 23, 18, 15,
+)
+CFS_LATENCY = 24
+CFS_MIN_GRANULARITY = 3
+
+def cfs_weight(priority):
+    # Priority is read as a nice value and clamped to -20..19.
+    return CFS_WEIGHTS[min(max(priority, -20), 19) + 20]
+
+def _cfs_engine(arrivals, progress=None, checkpoint_every=0, resume=None,
+                latency=CFS_LATENCY, min_granularity=CFS_MIN_GRANULARITY):
+    # Completely Fair Scheduler: the process with the least virtual runtime
+    # runs next, for its weight's share of the scheduling period (latency,
+    # stretched to min_granularity per runnable process). Virtual runtime
+    # grows by run * NICE_0_WEIGHT / weight and is kept as an integer in
+    # 1/NICE_0_WEIGHT ticks. Arrivals start at the queue's minimum virtual
+    # runtime and wait for the current slice to end.
+    arrivals = iter(arrivals)
+    pending = next(arrivals, None)
+    if resume is None:
+        seq, time, steps, ready, min_vruntime = 0, 0, 0, [], 0
+    else:
+        seq, time, steps, min_vruntime = resume.seq, resume.time, resume.steps, resume.extra
+        ready = [(vruntime, position, proc[:]) for vruntime, position, proc in resume.ready]
+    total_weight = sum(proc[6] for _, _, proc in ready)
+    time0, steps0, ready0, idle = time, steps, len(ready), 0
+
+    while True:
+        while pending is not None and pending[1] <= time:
+            weight = cfs_weight(pending[3])
+            heapq.heappush(ready, (min_vruntime, seq, [*pending, pending[2], None, weight]))
+            total_weight += weight
+            seq += 1
+            pending = next(arrivals, None)
+        if not ready:
+            if pending is None:
+                return EngineStats(time0, time, idle, steps - steps0, _requeue_ops(steps - steps0, ready0))
+            idle += pending[1] - time
+            time = pending[1]
+            continue
+        vruntime, position, proc = heapq.heappop(ready)
+        if proc[5] is None:
+            proc[5] = time
+        period = max(latency, (len(ready) + 1) * min_granularity)
+        run = min(proc[4], max(min_granularity, period * proc[6] // total_weight))
+        yield (proc[0], time, time + run)
+        time += run
+        proc[4] -= run
+        vruntime += run * NICE_0_WEIGHT * NICE_0_WEIGHT // proc[6]
+        min_vruntime = max(min_vruntime, min(vruntime, ready[0][0]) if ready else vruntime)
+        steps += 1
+        if progress is not None and steps % PROGRESS_EVERY == 0:
+            progress(time)
+
+        if proc[4] == 0:
+            total_weight -= proc[6]
+            yield Completion(position, proc[0], proc[1], proc[2], proc[3], proc[5], time)
+        else:
+            heapq.heappush(ready, (vruntime, position, proc))
+        if checkpoint_every and steps % checkpoint_every == 0:
+            yield Checkpoint(time, seq, steps, [(v, s, p[:]) for v, s, p in ready], min_vruntime)
+
+MLFQ_QUANTA = (2, 4, 8)
+MLFQ_BOOST = 100
+
+def _mlfq_engine(arrivals, progress=None, checkpoint_every=0, resume=None,
+                 quanta=MLFQ_QUANTA, boost=MLFQ_BOOST):
+    # Multi-level feedback queue with one level per quantum. New processes
+    # start on level 0 and drop a level once they have used up that level's
+    # quantum; the highest non-empty level runs round robin, and anything
+    # below level 0 is preempted when a process arrives. Every `boost` time
+    # units (0 disables it) all processes go back to level 0 with a fresh
+    # allowance. Level 0 is a deque of deques, so a boost moves the lower
+    # levels across whole and only bumps an epoch that resets allowances.
+    arrivals = iter(arrivals)
+    pending = next(arrivals, None)
+    bottom = len(quanta) - 1
+    if resume is None:
+        seq, time, steps, epoch = 0, 0, 0, 0
+        top, lower = deque(), [deque() for _ in quanta[1:]]
+    else:
+        seq, time, steps, epoch = resume.seq, resume.time, resume.steps, resume.extra
+        top = deque([deque(proc[:] for proc in resume.ready[0])])
+        lower = [deque(proc[:] for proc in level) for level in resume.ready[1:]]
+    next_boost = (time // boost + 1) * boost if boost else None
+    time0, steps0, idle = time, steps, 0
+    ready0 = sum(map(len, top)) + sum(map(len, lower))
+
+    def push(level, proc):
+        if level == 0:
+            if not top:
+                top.append(deque())
+            top[-1].append(proc)
+        else:
+            lower[level - 1].append(proc)
+
+    while True:
+        while pending is not None and pending[1] <= time:
+            # [pid, at, bt, priority, remaining, start, seq, used, epoch]
+            push(0, [*pending, pending[2], None, seq, 0, epoch])
+            seq += 1
+            pending = next(arrivals, None)
+        while top and not top[0]:
+            top.popleft()
+        if top:
+            level, proc = 0, top[0].popleft()
+        else:
+            level = next((i + 1 for i, queue in enumerate(lower) if queue), None)
+            if level is None:
+                if pending is None:
+                    return EngineStats(time0, time, idle, steps - steps0, _requeue_ops(steps - steps0, ready0))
+                # Boosts while the CPU is idle have nothing to move.
+                idle += pending[1] - time
+                time = pending[1]
+                if next_boost is not None and time >= next_boost:
+                    next_boost = (time // boost + 1) * boost
+                continue
+            proc = lower[level - 1].popleft()
+        if proc[8] != epoch:
+            proc[7], proc[8] = 0, epoch
+        if proc[5] is None:
+            proc[5] = time
+        run = min(proc[4], quanta[level] - proc[7])
+        if level and pending is not None:
+            run = min(run, pending[1] - time)
+        yield (proc[0], time, time + run)
+        time += run
+        proc[4] -= run
+        proc[7] += run
+        steps += 1
+        if progress is not None and steps % PROGRESS_EVERY == 0:
+            progress(time)
+
+        while pending is not None and pending[1] <= time:
+            push(0, [*pending, pending[2], None, seq, 0, epoch])
+            seq += 1
+            pending = next(arrivals, None)
+        if next_boost is not None and time >= next_boost:
+            top.extend(queue for queue in lower if queue)
+            lower = [deque() for _ in quanta[1:]]
+            epoch += 1
+            next_boost = (time // boost + 1) * boost
+
+        if proc[4] == 0:
+            yield Completion(proc[6], proc[0], proc[1], proc[2], proc[3], proc[5], time)
+        elif proc[8] != epoch:
+            proc[7], proc[8] = 0, epoch
+            push(0, proc)
+        elif proc[7] >= quanta[level]:
+            proc[7] = 0
+            push(min(level + 1, bottom), proc)
+        else:
+            push(level, proc)
+        if checkpoint_every and steps % checkpoint_every == 0:
+            yield Checkpoint(time, seq, steps,
+                             [[p[:] for queue in top for p in queue]] + [[p[:] for p in queue] for queue in lower],
+                             epoch)
+
+AGING_INTERVAL = 10
+AGING_CAP = 10
+
+def _aging_engine(arrivals, progress=None, checkpoint_every=0, resume=None,
+                  aging_interval=AGING_INTERVAL, aging_cap=AGING_CAP, preemptive=True):
+    # Priority scheduling where every aging_interval time units a process has
+    # spent waiting improve its priority by one level, by at most aging_cap
+    # levels; lower numbers run first. A process keeps what it has earned
+    # while it runs and after a preemption, and goes on aging from there.
+    #
+    # Effective priorities are never updated in place. Scaled by
+    # aging_interval, a process that had waited w before being queued at
+    # time e ranks at  interval*base - w + e - now  until it reaches the cap
+    # at e + interval*cap - w, and at  interval*(base - cap)  from then on.
+    # The first form only differs from process to process in its constant
+    # part, so aging processes sit in a heap on that and stay correctly
+    # ordered as time passes; capped ones sit in a second heap on theirs. A
+    # timer heap on the cap times moves processes across as they get there,
+    # and the entries they leave behind are dropped lazily, by enqueue token,
+    # when they reach the top.
+    #
+    # Without preemption a process runs to completion. With it, the running
+    # process is put back whenever an arrival, or a waiting process that
+    # has aged past it, ranks higher. Ties go to the earlier arrival. Gantt
+    # segments follow the engine each mode matches: preemptive segments run
+    # on across idle gaps as in _preemptive_engine, non-preemptive ones end
+    # with each run as in _non_preemptive_engine.
+    arrivals = iter(arrivals)
+    pending = next(arrivals, None)
+    interval, cap = aging_interval, aging_cap
+    aging, capped, timers = [], [], []
+    tokens = iter(range(1 << 62))
+
+    def enqueue(proc, enqueued):
+        # proc[7] is the token of its live heap entry, proc[8] its enqueue
+        # time and proc[9] its earlier waiting time.
+        token = next(tokens)
+        proc[7], proc[8] = token, enqueued
+        heapq.heappush(aging, (interval * proc[3] - proc[9] + enqueued, proc[6], token, proc))
+        heapq.heappush(timers, (enqueued + interval * cap - proc[9], token, proc))
+
+    if resume is None:
+        seq, time, steps = 0, 0, 0
+        open_pid, open_start = None, 0
+    else:
+        seq, time, steps = resume.seq, resume.time, resume.steps
+        open_pid, open_start = resume.extra
+        for proc in resume.ready:
+            proc = proc[:]
+            if proc[7] is None:
+                heapq.heappush(capped, (interval * (proc[3] - cap), proc[6], proc))
+            else:
+                enqueue(proc, proc[8])
+    time0, steps0, idle = time, steps, 0
+    ready0 = len(aging) + len(capped)
+
+    while True:
+        while pending is not None and pending[1] <= time:
+            # [pid, at, bt, priority, remaining, start, seq, token, enqueued, waited]
+            enqueue([*pending, pending[2], None, seq, None, 0, 0], pending[1])
+            seq += 1
+            pending = next(arrivals, None)
+        while timers and timers[0][0] <= time:
+            _, token, proc = heapq.heappop(timers)
+            if proc[7] == token:
+                proc[7] = None
+                heapq.heappush(capped, (interval * (proc[3] - cap), proc[6], proc))
+        while aging and aging[0][3][7] != aging[0][2]:
+            heapq.heappop(aging)
+        if not aging and not capped:
+            if pending is None:
+                break
+            if open_pid is not None and not preemptive:
+                yield (open_pid, open_start, time)
+                open_pid = None
+            idle += pending[1] - time
+            time = pending[1]
+            continue
+        if aging and (not capped or (aging[0][0] - time, aging[0][1]) < capped[0][:2]):
+            proc = heapq.heappop(aging)[3]
+            proc[7] = None
+        else:
+            proc = heapq.heappop(capped)[2]
+        proc[9] += time - proc[8]
+        if proc[5] is None:
+            proc[5] = time
+        if open_pid != proc[0]:
+            if open_pid is not None:
+                yield (open_pid, open_start, time)
+            open_pid, open_start = proc[0], time
+        run = proc[4]
+        if preemptive:
+            if pending is not None:
+                run = min(run, pending[1] - time)
+            # The first waiting process to age past this one is the aging
+            # heap's top, unless that reaches its cap first; either way
+            # the next decision sorts it out.
+            while timers and timers[0][2][7] != timers[0][1]:
+                heapq.heappop(timers)
+            while aging and aging[0][3][7] != aging[0][2]:
+                heapq.heappop(aging)
+            if aging:
+                key, position = aging[0][:2]
+                rank = interval * proc[3] - min(interval * cap, proc[9])
+                run = min(run, key - rank + (position > proc[6]) - time)
+            if timers:
+                run = min(run, timers[0][0] - time)
+        proc[4] -= run
+        time += run
+        steps += 1
+        if progress is not None and steps % PROGRESS_EVERY == 0:
+            progress(time)
+        if proc[4] == 0:
+            yield Completion(proc[6], proc[0], proc[1], proc[2], proc[3], proc[5], time)
+        else:
+            enqueue(proc, time)
+        if checkpoint_every and steps % checkpoint_every == 0:
+            waiting = [entry[3][:] for entry in aging if entry[3][7] == entry[2]]
+            waiting += [entry[2][:] for entry in capped]
+            yield Checkpoint(time, seq, steps, waiting, (open_pid, open_start))
+
+    if open_pid is not None:
+        yield (open_pid, open_start, time)
+    return EngineStats(time0, time, idle, steps - steps0, _requeue_ops(steps - steps0, ready0))
+
+# Multi-core runs: the single-CPU policies on `cores` identical CPUs.
+MULTICORE_ALGORITHMS = ('fcfs', 'sjf_non_preemptive', 'srtf', 'priority_non_preemptive', 'priority_preemptive',
+                        'round_robin')
+RUN_QUEUES = ('global', 'per_core')
+BALANCERS = ('least_loaded', 'round_robin')
+
+def _multicore_engine(arrivals, algorithm, cores, quantum=2, queues='global', balance='least_loaded', steal=True,
+                      progress=None):
+    # Event-driven like the single-CPU engines: time only moves to the next
+    # arrival or the next time a core's run ends, never tick by tick. Yields
+    # (pid, start, end, core) segments, one per uninterrupted run on a core,
+    # and Completion records.
+    #
+    # With a global queue every core takes the next process from one ready
+    # heap, idle cores lowest number first. The preemptive policies keep the
+    # `cores` best processes running: an arrival that outranks the worst
+    # running one takes its core. That one is found through a second heap of
+    # the running processes; for SRTF it is keyed on the finish time, since
+    # remaining time falls at the same rate on every core.
+    #
+    # With per-core queues each arrival is placed on one core's queue, the
+    # least loaded (queued plus running) or the next in turn, and only
+    # competes with what runs there. Preempted processes and expired Round
+    # Robin slices go back to their own core. With steal set, a core left
+    # with nothing to do takes the next process from the longest queue.
+    arrivals = iter(arrivals)
+    pending = next(arrivals, None)
+    rank_field = {'sjf_non_preemptive': 2, 'srtf': 4, 'priority_non_preemptive': 3,
+                  'priority_preemptive': 3}.get(algorithm)
+    preemptive = algorithm in ('srtf', 'priority_preemptive')
+    by_remaining = algorithm == 'srtf'
+    slice_ = quantum if algorithm == 'round_robin' else None
+    per_core = queues == 'per_core'
+    least_loaded = per_core and balance == 'least_loaded'
+    ready = [[] for _ in range(cores if per_core else 1)]
+    running = [None] * cores
+    tokens = [0] * cores
+    # (end, core, token) of every run, and (-rank, -seq, core, token) of the
+    # preemptible ones; entries whose token is out of date are skipped.
+    ends, victims = [], []
+    free = list(range(cores))
+    # Per-core loads, with a lazy heap of (load, core) for the least loaded.
+    loads = [0] * cores
+    lightest = [(0, core) for core in range(cores)]
+    time = seq = order = steps = reported = idle = pushes = queued = busy = 0
+
+    def dispatch(core, proc):
+        # proc: [pid, at, bt, priority, remaining, start, seq, queue, dispatched]
+        proc[8] = time
+        if proc[5] is None:
+            proc[5] = time
+        running[core] = proc
+        tokens[core] += 1
+        end = time + (proc[4] if slice_ is None else min(slice_, proc[4]))
+        heapq.heappush(ends, (end, core, tokens[core]))
+        if preemptive:
+            heapq.heappush(victims, (-(end if by_remaining else proc[3]), -proc[6], core, tokens[core]))
+
+    def load(core, change):
+        loads[core] += change
+        if least_loaded:
+            if len(lightest) > 8 * cores:
+                lightest[:] = [(n, c) for c, n in enumerate(loads)]
+                heapq.heapify(lightest)
+            heapq.heappush(lightest, (loads[core], core))
+
+    while True:
+        while ends and ends[0][2] != tokens[ends[0][1]]:
+            heapq.heappop(ends)
+        if ends:
+            time = ends[0][0] if pending is None or ends[0][0] <= pending[1] else pending[1]
+        elif pending is not None:
+            idle += pending[1] - time
+            time = pending[1]
+        else:
+            break
+        touched = []
+        expired = []
+        while ends and ends[0][0] == time:
+            _, core, token = heapq.heappop(ends)
+            if token != tokens[core]:
+                continue
+            proc = running[core]
+            running[core] = None
+            busy -= 1
+            proc[4] -= time - proc[8]
+            yield (proc[0], proc[8], time, core)
+            if proc[4] == 0:
+                yield Completion(proc[6], proc[0], proc[1], proc[2], proc[3], proc[5], time)
+                if per_core:
+                    load(core, -1)
+            else:
+                expired.append(proc)
+            if per_core:
+                touched.append(core)
+            else:
+                heapq.heappush(free, core)
+        # As on one CPU, arrivals join before the slices that just ran out.
+        while pending is not None and pending[1] <= time:
+            if not per_core:
+                queue = 0
+            elif least_loaded:
+                while lightest[0][0] != loads[lightest[0][1]]:
+                    heapq.heappop(lightest)
+                queue = lightest[0][1]
+            else:
+                queue = seq % cores
+            proc = [*pending, pending[2], None, seq, queue, 0]
+            heapq.heappush(ready[queue], (order if rank_field is None else proc[rank_field], seq, proc))
+            order += 1
+            seq += 1
+            pushes += 1
+            queued += 1
+            if per_core:
+                load(queue, 1)
+                touched.append(queue)
+            pending = next(arrivals, None)
+        for proc in expired:
+            heapq.heappush(ready[proc[7]], (order, proc[6], proc))
+            order += 1
+            pushes += 1
+            queued += 1
+
+        if per_core:
+            for core in touched:
+                if running[core] is None and ready[core]:
+                    dispatch(core, heapq.heappop(ready[core])[2])
+                    queued -= 1
+                    busy += 1
+                    steps += 1
+                elif preemptive and running[core] is not None and ready[core]:
+                    current = running[core]
+                    rank = current[8] + current[4] - time if by_remaining else current[3]
+                    if ready[core][0][:2] < (rank, current[6]):
+                        current[4] -= time - current[8]
+                        yield (current[0], current[8], time, core)
+                        heapq.heappush(ready[core], (current[4] if by_remaining else current[3], current[6], current))
+                        dispatch(core, heapq.heappop(ready[core])[2])
+                        pushes += 1
+                        steps += 1
+            # Idle cores fill up from the lowest number, so the next one is
+            # always further on.
+            core = -1
+            while steal and queued and busy < cores:
+                core = running.index(None, core + 1)
+                lengths = list(map(len, ready))
+                victim = lengths.index(max(lengths))
+                proc = heapq.heappop(ready[victim])[2]
+                proc[7] = core
+                load(victim, -1)
+                load(core, 1)
+                dispatch(core, proc)
+                queued -= 1
+                busy += 1
+                steps += 1
+        else:
+            queue = ready[0]
+            while free and queue:
+                dispatch(heapq.heappop(free), heapq.heappop(queue)[2])
+                queued -= 1
+                busy += 1
+                steps += 1
+            while preemptive and queue:
+                while victims[0][3] != tokens[victims[0][2]]:
+                    heapq.heappop(victims)
+                rank, position, core, _ = victims[0]
+                rank = -rank - time if by_remaining else -rank
+                if queue[0][:2] >= (rank, -position):
+                    break
+                heapq.heappop(victims)
+                current = running[core]
+                current[4] -= time - current[8]
+                yield (current[0], current[8], time, core)
+                proc = heapq.heapreplace(queue, (current[4] if by_remaining else current[3], current[6], current))[2]
+                dispatch(core, proc)
+                pushes += 1
+                steps += 1
+        if progress is not None and steps - reported >= PROGRESS_EVERY:
+            progress(time)
+            reported = steps
+    # One pop per dispatch.
+    return EngineStats(0, time, idle, steps, pushes + steps)
+
+def _engine(algorithm, arrivals, quantum=2, progress=None, checkpoint_every=0, resume=None, **params):
+    # params are the keyword options of cfs(), mlfq() and priority_aging().
+    options = (progress, checkpoint_every, resume)
+    if algorithm == 'fcfs':
+        return _non_preemptive_engine(arrivals, None, *options)
+    if algorithm == 'sjf_non_preemptive':
+        return _non_preemptive_engine(arrivals, 2, *options)
+    if algorithm == 'priority_non_preemptive':
+        return _non_preemptive_engine(arrivals, 3, *options)
+    if algorithm == 'srtf':
+        return _preemptive_engine(arrivals, False, *options)
+    if algorithm == 'priority_preemptive':
+        return _preemptive_engine(arrivals, True, *options)
+    if algorithm == 'round_robin':
+        if quantum < 1:
+            raise ValueError("Round Robin quantum must be at least 1")
+        return _round_robin_engine(arrivals, quantum, *options)
+    if algorithm == 'cfs':
+        if params.get('latency', CFS_LATENCY) < 1 or params.get('min_granularity', CFS_MIN_GRANULARITY) < 1:
+            raise ValueError("CFS latency and minimum granularity must be at least 1")
+        return _cfs_engine(arrivals, *options, **params)
+    if algorithm == 'mlfq':
+        quanta = params.get('quanta', MLFQ_QUANTA)
+        if not quanta or min(quanta) < 1:
+            raise ValueError("MLFQ needs at least one level and every quantum must be at least 1")
+        if (params.get('boost', MLFQ_BOOST) or 0) < 0:
+            raise ValueError("MLFQ boost period cannot be negative")
+        return _mlfq_engine(arrivals, *options, **params)
+    if algorithm == 'priority_aging':
+        if params.get('aging_interval', AGING_INTERVAL) < 1:
+            raise ValueError("The aging interval must be at least 1")
+        if params.get('aging_cap', AGING_CAP) < 0:
+            raise ValueError("The aging cap cannot be negative")
+        return _aging_engine(arrivals, *options, **params)
+    raise ValueError(f"Unknown algorithm {algorithm!r}, expected one of {', '.join(ALGORITHMS)}")
+
+def stream_schedule(algorithm, arrivals, quantum=2, progress=None, profile=None, **params):
+    # Online form of schedule(): arrivals is an iterable of (PID, AT, BT,
+    # Priority) tuples or process dicts in AT order, consumed lazily. Yields
+    # (pid, start, end) segments and Completion records as they become final.
+    events = _engine(algorithm, _checked_arrivals(arrivals), quantum, progress, **params)
+    return events if profile is None else profile.track(events, switches=True)
+
+# Batch driver shared by every run over a whole table: the engine is fed
+# the table in stable AT order and its completion records are scattered
+# back into the ST/CT columns by Seq.
+def _sorted_arrivals(table):
+    # The arrival order and the input columns in it, one row per column.
+    order = np.argsort(table['AT'], kind='stable')
+    return order, np.stack([table[name][order] for name in ProcessTable.INPUT_COLUMNS])
+
+def _drain(events, start, finish, add_segment, add_checkpoint=None, profile=None, switches=False):
+    # Runs an engine to the end, filling start and finish by Seq and handing
+    # segments and checkpoints to the given callables.
+    if profile is not None:
+        profile.lap('setup')
+        events = profile.track(events, switches)
+    for event in events:
+        if event.__class__ is Completion:
+            start[event.Seq] = event.ST
+            finish[event.Seq] = event.CT
+        elif event.__class__ is Checkpoint:
+            add_checkpoint(event)
+        else:
+            add_segment(event)
+    if profile is not None:
+        profile.lap('main_loop')
+
+def _drive(table, engine, add_segment, profile=None, switches=False):
+    # engine(arrivals) returns the event generator to run.
+    order, arrivals = _sorted_arrivals(table)
+    n = len(table)
+    start = [0]*n
+    finish = [0]*n
+    _drain(engine(zip(*arrivals.tolist())), start, finish, add_segment, profile=profile, switches=switches)
+    table['ST'][order] = start
+    table['CT'][order] = finish
+    if profile is not None:
+        profile.lap('merge')
+
+def _run_engine(table, algorithm, quantum=2, progress=None, params=None, profile=None):
+    gantt = []
+    _drive(table, lambda arrivals: _engine(algorithm, arrivals, quantum, progress, **(params or {})),
+           gantt.append, profile)
+    return gantt
+
+def schedule_segments(algorithm, table, add_segment, quantum=2, progress=None, profile=None, **params):
+    # Runs algorithm over a ProcessTable like schedule(), filling its ST and
+    # CT columns, but hands each gantt segment to add_segment as soon as it
+    # is final instead of collecting the gantt. A profile gets the setup,
+    # main_loop and merge phases and the context switches; start() it first.
+    _drive(table, lambda arrivals: _engine(algorithm, arrivals, quantum, progress, **params), add_segment,
+           profile, switches=True)
+
+def sjf_non_preemptive(processes, progress=None, profile=None):
+    return _run_on_table(_run_engine, processes, 'sjf_non_preemptive', 2, progress, profile=profile)
+
+def srtf(processes, progress=None, profile=None):
+    return _run_on_table(_run_engine, processes, 'srtf', 2, progress, profile=profile)
+
+def priority_non_preemptive(processes, progress=None, profile=None):
+    return _run_on_table(_run_engine, processes, 'priority_non_preemptive', 2, progress, profile=profile)
+
+def priority_preemptive(processes, progress=None, profile=None):
+    return _run_on_table(_run_engine, processes, 'priority_preemptive', 2, progress, profile=profile)
+
+def round_robin(processes, quantum=2, progress=None, profile=None):
+    if quantum < 1:
+        raise ValueError("Round Robin quantum must be at least 1")
+    return _run_on_table(_run_engine, processes, 'round_robin', quantum, progress, profile=profile)
+
+def cfs(processes, latency=CFS_LATENCY, min_granularity=CFS_MIN_GRANULARITY, progress=None, profile=None):
+    # Priority is the nice value (-20..19, lower gets more CPU); without
+    # priorities every process has the nice 0 weight.
+    return _run_on_table(_run_engine, processes, 'cfs', 2, progress,
+                         {'latency': latency, 'min_granularity': min_granularity}, profile=profile)
+
+def mlfq(processes, quanta=MLFQ_QUANTA, boost=MLFQ_BOOST, progress=None, profile=None):
+    # quanta gives one level per entry, highest priority first.
+    return _run_on_table(_run_engine, processes, 'mlfq', 2, progress,
+                         {'quanta': tuple(quanta), 'boost': boost}, profile=profile)
+
+def priority_aging(processes, aging_interval=AGING_INTERVAL, aging_cap=AGING_CAP, preemptive=True, progress=None,
+                   profile=None):
+    # Priority scheduling (lower runs first) where every aging_interval time
+    # units of waiting count as one level better, up to aging_cap levels.
+    return _run_on_table(_run_engine, processes, 'priority_aging', 2, progress,
+                         {'aging_interval': aging_interval, 'aging_cap': aging_cap, 'preemptive': bool(preemptive)},
+                         profile=profile)
+
+ALGORITHMS = {
+    'fcfs': fcfs,
+    'sjf_non_preemptive': sjf_non_preemptive,
+    'srtf': srtf,
+    'priority_non_preemptive': priority_non_preemptive,
+    'priority_preemptive': priority_preemptive,
+    'round_robin': round_robin,
+    'cfs': cfs,
+    'mlfq': mlfq,
+    'priority_aging': priority_aging,
+}
+
+def schedule(algorithm, processes, quantum=2, progress=None, profile=None, **params):
+    # params are passed on to algorithms that take more options, i.e. the
+    # keyword arguments of cfs(), mlfq() and priority_aging().
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm {algorithm!r}, expected one of {', '.join(ALGORITHMS)}")
+    if algorithm == 'round_robin':
+        return round_robin(processes, quantum=quantum, progress=progress, profile=profile)
+    if algorithm == 'fcfs':
+        # FCFS is a handful of array operations; there is nothing to report.
+        return fcfs(processes, profile=profile)
+    return ALGORITHMS[algorithm](processes, progress=progress, profile=profile, **params)
+
+def _multicore(algorithm, arrivals, cores, quantum=2, progress=None, queues='global', balance='least_loaded',
+               steal=True):
+    if algorithm not in MULTICORE_ALGORITHMS:
+        raise ValueError(f"Unknown multi-core algorithm {algorithm!r}, expected one of "
+                         f"{', '.join(MULTICORE_ALGORITHMS)}")
+    if queues not in RUN_QUEUES:
+        raise ValueError(f"Unknown run queue layout {queues!r}, expected one of {', '.join(RUN_QUEUES)}")
+    if balance not in BALANCERS:
+        raise ValueError(f"Unknown load balancer {balance!r}, expected one of {', '.join(BALANCERS)}")
+    if cores < 1:
+        raise ValueError("A multi-core run needs at least one core")
+    if quantum < 1:
+        raise ValueError("Round Robin quantum must be at least 1")
+    return _multicore_engine(arrivals, algorithm, cores, quantum, queues, balance, steal, progress)
+
+def multicore_schedule(algorithm, processes, cores, quantum=2, progress=None, profile=None, **options):
+    # schedule() on `cores` identical CPUs. options are queues ('global' or
+    # 'per_core'), balance ('least_loaded' or 'round_robin') and steal, as
+    # described at _multicore_engine(). Returns the processes with their
+    # results and the gantt as one list of (pid, start, end) per core.
+    if profile is not None:
+        profile.start()
+    table = processes if isinstance(processes, ProcessTable) else ProcessTable.from_dicts(processes)
+    lanes = [[] for _ in range(cores)]
+    _drive(table, lambda arrivals: _multicore(algorithm, arrivals, cores, quantum, progress, **options),
+           lambda segment: lanes[segment[3]].append(segment[:3]), profile)
+    table.compute_metrics()
+    if profile is not None:
+        profile.lap('metrics')
+    if table is not processes:
+        table.update_dicts(processes)
+    if profile is not None:
+        profile.lap('merge')
+        profile.context_switches += sum(map(context_switches, lanes))
+    return processes, lanes
+
+class IncrementalScheduler:
+    # Runs one algorithm over a workload that changes a little between runs,
+    # as the GUI's process list does. Each run keeps the engine checkpoints
+    # it passed; the next run finds the first arrival that was added, removed
+    # or edited, resumes from the latest checkpoint before that arrival's AT
+    # and reuses the gantt and results recorded up to there.
+    MAX_CHECKPOINTS = 64
+    MIN_CHECKPOINT_EVERY = 256
+
+    def __init__(self, algorithm, quantum=2, **params):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm {algorithm!r}, expected one of {', '.join(ALGORITHMS)}")
+        # Validates the parameters without running anything.
+        _engine(algorithm, (), quantum, **params)
+        self.algorithm = algorithm
+        self.quantum = quantum
+        self.params = params
+        # Simulated time the last run resumed from; None after a full run.
+        self.resumed_at = None
+        self._arrivals = np.zeros((len(ProcessTable.INPUT_COLUMNS), 0), dtype=np.int64)
+        self._start = []
+        self._finish = []
+        self._gantt = []
+        # (Checkpoint, gantt length at that point) pairs in time order.
+        self._checkpoints = []
+
+    def _checkpoint_every(self, arrivals):
+        # Keep roughly MAX_CHECKPOINTS per run, since each one copies the
+        # ready queue.
+        dispatches = arrivals.shape[1]
+        slice_ = {'round_robin': self.quantum,
+                  'cfs': self.params.get('min_granularity', CFS_MIN_GRANULARITY),
+                  'mlfq': min(self.params.get('quanta', MLFQ_QUANTA))}.get(self.algorithm)
+        if slice_:
+            dispatches = int(((arrivals[2] + slice_ - 1) // slice_).sum())
+        return max(self.MIN_CHECKPOINT_EVERY, dispatches // self.MAX_CHECKPOINTS)
+
+    def _first_change(self, arrivals):
+        # Position of the first arrival that differs from the last run and
+        # the earliest AT involved, or None for the time if nothing changed.
+        old = self._arrivals
+        m = min(old.shape[1], arrivals.shape[1])
+        diff = np.flatnonzero((old[:, :m] != arrivals[:, :m]).any(axis=0))
+        k = int(diff[0]) if len(diff) else m
+        times = [int(a[1, k]) for a in (old, arrivals) if k < a.shape[1]]
+        return k, min(times) if times else None
+
+    def _simulate(self, arrivals, progress, profile):
+        k, changed_at = self._first_change(arrivals)
+        if changed_at is None:
+            self.resumed_at = self._gantt[-1][2] if self._gantt else 0
+            return
+        # A checkpoint strictly before the change has only admitted arrivals
+        # ahead of position k, which are the same in both runs.
+        i = bisect_left([c.time for c, _ in self._checkpoints], changed_at)
+        checkpoints = self._checkpoints[:i]
+        resume, kept = checkpoints[-1] if checkpoints else (None, 0)
+        self.resumed_at = resume.time if resume else None
+        n = arrivals.shape[1]
+        start = self._start[:k] + [0]*(n - k)
+        finish = self._finish[:k] + [0]*(n - k)
+        gantt = self._gantt[:kept]
+        rows = zip(*arrivals[:, resume.seq if resume else 0:].tolist())
+        events = _engine(self.algorithm, rows, self.quantum, progress,
+                         self._checkpoint_every(arrivals), resume, **self.params)
+        _drain(events, start, finish, gantt.append, lambda checkpoint: checkpoints.append((checkpoint, len(gantt))),
+               profile)
+        # Only commit once the run has finished, so a cancelled run leaves
+        # the previous state usable.
+        self._arrivals, self._start, self._finish = arrivals, start, finish
+        self._gantt, self._checkpoints = gantt, checkpoints
+
+    def run(self, processes, progress=None, profile=None):
+        # Returns (processes, gantt) like schedule(algorithm, processes, quantum).
+        # A profile only counts the part of the schedule that was redone.
+        if profile is not None:
+            profile.start()
+        table = processes if isinstance(processes, ProcessTable) else ProcessTable.from_dicts(processes)
+        order, arrivals = _sorted_arrivals(table)
+        self._simulate(arrivals, progress, profile)
+        table['ST'][order] = self._start
+        table['CT'][order] = self._finish
+        gantt = list(self._gantt)
+        if profile is not None:
+            profile.lap('merge')
+        table.compute_metrics()
+        if profile is not None:
+            profile.lap('metrics')
+        if table is not processes:
+            table.update_dicts(processes)
+        if profile is not None:
+            profile.lap('merge')
+            profile.context_switches += context_switches(gantt)
+        return processes, gantt
+
+def gantt_array(gantt):
+    # The gantt as an (n, 3) int64 array of (pid, start, end) rows. Arrays,
+    # including memory-mapped trace segments, are used as they are.
+    if isinstance(gantt, np.ndarray):
+        return gantt.reshape(-1, 3).astype(np.int64, copy=False)
+    return np.fromiter(chain.from_iterable(gantt), dtype=np.int64, count=3*len(gantt)).reshape(-1, 3)
+
+def context_switches(gantt):
+    pids = gantt_array(gantt)[:, 0]
+    return int(np.count_nonzero(pids[1:] != pids[:-1]))
+
+LATENCY_METRICS = ('TAT', 'WT', 'RT')
+PERCENTILES = (50, 90, 99)
+
+def jain_index(values):
+    # (sum x)^2 / (n * sum x^2): 1.0 when every value is equal, down to 1/n
+    # when one process gets everything.
+    square_sum = float(np.dot(values, values))
+    return float(values.sum())**2 / (len(values) * square_sum) if square_sum else 1.0
+
+def summarize(table, gantt):
+    # Latency percentiles come from one np.percentile call over the stacked
+    # TAT/WT/RT columns. Throughput and CPU utilization are taken over the
+    # makespan, from the first arrival to the last completion. Busy time is
+    # the BT total rather than the segment lengths, since the preemptive
+    # policies' segments run on across idle gaps up to the next dispatch.
+    # Fairness is Jain's index of BT/TAT, the share of its time in the
+    # system each process spent running.
+    n = len(table)
+    segments = gantt_array(gantt)
+    summary = {}
+    latencies = np.stack([table[name] for name in LATENCY_METRICS]) if n else None
+    if n:
+        averages = latencies.mean(axis=1)
+        maxima = latencies.max(axis=1)
+        percentiles = np.percentile(latencies, PERCENTILES, axis=1)
+    for i, name in enumerate(LATENCY_METRICS):
+        summary['Avg' + name] = float(averages[i]) if n else 0.0
+        for j, p in enumerate(PERCENTILES):
+            summary[f'P{p}{name}'] = float(percentiles[j, i]) if n else 0.0
+        summary['Max' + name] = int(maxima[i]) if n else 0
+    makespan = int(table['CT'].max() - table['AT'].min()) if n else 0
+    busy = int(table['BT'].sum())
+    summary['Throughput'] = n / makespan if makespan else 0.0
+    summary['CPUUtilization'] = busy / makespan if makespan else 0.0
+    summary['ContextSwitches'] = int(np.count_nonzero(segments[1:, 0] != segments[:-1, 0]))
+    summary['Fairness'] = jain_index(table['BT'] / np.maximum(table['TAT'], 1)) if n else 1.0
+    summary['Makespan'] = makespan
+    return summary
+
+def core_utilization(lanes, makespan):
+    # The fraction of the makespan each core spent running, as an array.
+    # Multi-core segments never span idle time, so their lengths add up.
+    busy = np.array([np.diff(gantt_array(lane)[:, 1:], axis=1).sum() for lane in lanes], dtype=np.int64)
+    return busy / makespan if makespan else np.zeros(len(lanes))
+
+def summarize_cores(table, lanes):
+    # summarize() for a multi-core run: CPU utilization is over all the
+    # cores together, context switches are counted on each core, and
+    # CoreUtilization lists every core's own share.
+    summary = summarize(table, ())
+    summary['CPUUtilization'] /= len(lanes)
+    summary['ContextSwitches'] = sum(map(context_switches, lanes))
+    summary['Cores'] = len(lanes)
+    summary['CoreUtilization'] = core_utilization(lanes, summary['Makespan']).tolist()
+    return summary
+
+CORES_PER_LINE = 8
+
+def format_summary(summary):
+    # Aligned text lines, like RunProfile.format().
+    lines = [f"{'':4}" + ''.join(f"{label:>10}" for label in
+                                 ['Avg'] + [f'P{p}' for p in PERCENTILES] + ['Max'])]
+    for name in LATENCY_METRICS:
+        values = ([summary['Avg' + name]] + [summary[f'P{p}{name}'] for p in PERCENTILES]
+                  + [summary['Max' + name]])
+        lines.append(f"{name:4}" + ''.join(f"{value:>10.2f}" for value in values))
+    lines += [f"{'Throughput':20} {summary['Throughput']:.4f} per time unit",
+              f"{'CPU utilization':20} {summary['CPUUtilization']:.1%}",
+              f"{'Context switches':20} {summary['ContextSwitches']}",
+              f"{'Fairness (Jain)':20} {summary['Fairness']:.4f}",
+              f"{'Makespan':20} {summary['Makespan']}"]
+    if 'CoreUtilization' in summary:
+        shares = summary['CoreUtilization']
+        lines.append(f"{'Cores':20} {summary['Cores']}")
+        for first in range(0, len(shares), CORES_PER_LINE):
+            label = f"Core {first}-{min(first + CORES_PER_LINE, len(shares)) - 1}"
+            lines.append(f"{label:20}" + ''.join(f" {share:6.1%}" for share in shares[first:first + CORES_PER_LINE]))
+    return '\n'.join(lines)
+
+class LatencySketch:
+    # Quantile sketch with relative error guarantees (DDSketch): a positive
+    # value v is counted in bucket ceil(log_gamma(v)), and a quantile is read
+    # back as the midpoint of its bucket, within relative_accuracy of the
+    # exact one. Zeros get their own counter. Memory grows with the log of
+    # the largest value, not with the count, and two sketches with the same
+    # accuracy merge by adding their buckets.
+    def __init__(self, relative_accuracy=0.01):
+        self.relative_accuracy = relative_accuracy
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = np.log(self._gamma)
+        self._counts = np.zeros(0, dtype=np.int64)
+        self._offset = 0
+        self.zeros = 0
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def _grow(self, low, high):
+        # Makes buckets low..high addressable.
+        if not len(self._counts):
+            self._offset = low
+            self._counts = np.zeros(high - low + 1, dtype=np.int64)
+            return
+        new_low = min(low, self._offset)
+        new_high = max(high, self._offset + len(self._counts) - 1)
+        if new_low == self._offset and new_high == self._offset + len(self._counts) - 1:
+            return
+        counts = np.zeros(new_high - new_low + 1, dtype=np.int64)
+        counts[self._offset - new_low:self._offset - new_low + len(self._counts)] = self._counts
+        self._counts = counts
+        self._offset = new_low
+
+    def add(self, values):
+        values = np.asarray(values, dtype=np.int64)
+        if not len(values):
+            return
+        self.count += len(values)
+        self.total += int(values.sum())
+        self.max = max(self.max, int(values.max()))
+        positive = values[values > 0]
+        self.zeros += len(values) - len(positive)
+        if not len(positive):
+            return
+        buckets = np.ceil(np.log(positive) / self._log_gamma).astype(np.int64)
+        low, high = int(buckets.min()), int(buckets.max())
+        self._grow(low, high)
+        self._counts[low - self._offset:high - self._offset + 1] += np.bincount(buckets - low)
+
+    def merge(self, other):
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Only sketches with the same relative accuracy can be merged")
+        if len(other._counts):
+            self._grow(other._offset, other._offset + len(other._counts) - 1)
+            start = other._offset - self._offset
+            self._counts[start:start + len(other._counts)] += other._counts
+        self.zeros += other.zeros
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        return self
+
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q):
+        # q in [0, 1]; the value at rank q * (count - 1).
+        if not self.count:
+            return 0.0
+        rank = q * (self.count - 1)
+        if rank < self.zeros:
+            return 0.0
+        index = int(np.searchsorted(np.cumsum(self._counts), rank - self.zeros, side='right'))
+        index = min(index, len(self._counts) - 1)
+        return min(2 * self._gamma**(index + self._offset) / (self._gamma + 1), float(self.max))
+
+class StreamingSummary:
+    # summarize() for runs whose results arrive in pieces. Completion
+    # records, result tables and gantt segments are added as they are
+    # produced; memory does not grow with the run. The latency percentiles
+    # are LatencySketch estimates, everything else is exact. Two summaries
+    # merge as if the second's input had followed the first's.
+    def __init__(self, relative_accuracy=0.01):
+        self.sketches = {name: LatencySketch(relative_accuracy) for name in LATENCY_METRICS}
+        self.n = 0
+        self.first_at = None
+        self.last_ct = None
+        self.busy = 0
+        self.switches = 0
+        self.first_pid = None
+        self.last_pid = None
+        self._fair_sum = 0.0
+        self._fair_square_sum = 0.0
+
+    def add_results(self, at, bt, st, ct):
+        at, bt, st, ct = (np.asarray(c, dtype=np.int64) for c in (at, bt, st, ct))
+        if not len(at):
+            return
+        tat = ct - at
+        self.sketches['TAT'].add(tat)
+        self.sketches['WT'].add(tat - bt)
+        self.sketches['RT'].add(st - at)
+        self.n += len(at)
+        self.busy += int(bt.sum())
+        first_at, last_ct = int(at.min()), int(ct.max())
+        self.first_at = first_at if self.first_at is None else min(self.first_at, first_at)
+        self.last_ct = last_ct if self.last_ct is None else max(self.last_ct, last_ct)
+        share = bt / np.maximum(tat, 1)
+        self._fair_sum += float(share.sum())
+        self._fair_square_sum += float(np.dot(share, share))
+
+    def add_table(self, table):
+        self.add_results(table['AT'], table['BT'], table['ST'], table['CT'])
+
+    def add_completions(self, completions):
+        if completions:
+            rows = np.array(completions, dtype=np.int64)
+            self.add_results(rows[:, 2], rows[:, 3], rows[:, 5], rows[:, 6])
+
+    def add_segments(self, segments):
+        segments = gantt_array(segments)
+        if not len(segments):
+            return
+        pids = segments[:, 0]
+        self.switches += int(np.count_nonzero(pids[1:] != pids[:-1]))
+        if self.last_pid is not None and self.last_pid != pids[0]:
+            self.switches += 1
+        if self.first_pid is None:
+            self.first_pid = int(pids[0])
+        self.last_pid = int(pids[-1])
+
+    def merge(self, other):
+        for name, sketch in self.sketches.items():
+            sketch.merge(other.sketches[name])
+        self.n += other.n
+        if other.first_at is not None:
+            self.first_at = other.first_at if self.first_at is None else min(self.first_at, other.first_at)
+            self.last_ct = other.last_ct if self.last_ct is None else max(self.last_ct, other.last_ct)
+        self.busy += other.busy
+        self.switches += other.switches
+        if other.first_pid is not None:
+            if self.last_pid is not None and self.last_pid != other.first_pid:
+                self.switches += 1
+            if self.first_pid is None:
+                self.first_pid = other.first_pid
+            self.last_pid = other.last_pid
+        self._fair_sum += other._fair_sum
+        self._fair_square_sum += other._fair_square_sum
+        return self
+
+    def summary(self):
+        summary = {}
+        for name in LATENCY_METRICS:
+            sketch = self.sketches[name]
+            summary['Avg' + name] = sketch.mean()
+            for p in PERCENTILES:
+                summary[f'P{p}{name}'] = sketch.quantile(p / 100)
+            summary['Max' + name] = sketch.max
+        makespan = self.last_ct - self.first_at if self.n else 0
+        summary['Throughput'] = self.n / makespan if makespan else 0.0
+        summary['CPUUtilization'] = self.busy / makespan if makespan else 0.0
+        summary['ContextSwitches'] = self.switches
+        summary['Fairness'] = (self._fair_sum**2 / (self.n * self._fair_square_sum)
+                               if self._fair_square_sum else 1.0)
+        summary['Makespan'] = makespan
+        return summary
@@ -1,306 +1,713 @@
 from qtpy.QtWidgets import (
     QApplication, QWidget, QLabel, QPushButton, QVBoxLayout, QStackedWidget,
-    QMainWindow, QSizePolicy, QLineEdit, QSpinBox, QTableWidget, QTableWidgetItem,
-    QGridLayout, QMessageBox, QHBoxLayout, QSizePolicy
+    QMainWindow, QSizePolicy, QLineEdit, QSpinBox, QTableView, QHeaderView,
+    QGridLayout, QMessageBox, QHBoxLayout, QSizePolicy, QProgressDialog, QCheckBox, QGroupBox,
+    QFileDialog, QSlider, QComboBox, QDialog, QDialogButtonBox, QFormLayout, QDoubleSpinBox
 )
-from qtpy.QtCore import Qt
+from qtpy.QtCore import Qt, QAbstractTableModel, QModelIndex, QThread, QTimer, Signal
+import matplotlib
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
+from matplotlib.collections import PolyCollection
+from matplotlib.colors import to_rgba_array
 from matplotlib.figure import Figure
+from matplotlib.patches import Rectangle
+from matplotlib.ticker import AutoLocator, ScalarFormatter
+import csv
+import io
+import numpy as np
 import sys
+import time
 
-# -------------------- Scheduling Algorithms --------------------
-
-def fcfs(processes):
-    processes = sorted(processes, key=lambda p: p['AT'])
-    time = 0
-    gantt = []
-    for p in processes:
-        if time < p['AT']:
-            time = p['AT']
-        p['ST'] = time
-        p['CT'] = time + p['BT']
-        p['TAT'] = p['CT'] - p['AT']
-        p['WT'] = p['TAT'] - p['BT']
-        p['RT'] = p['ST'] - p['AT']
-        gantt.append((p['PID'], p['ST'], p['CT']))
-        time = p['CT']
-    return processes, gantt
-
-def sjf_non_preemptive(processes):
-    n = len(processes)
-    completed = 0
-    time = 0
-    is_completed = [False]*n
-    gantt = []
-    proc_list = [p.copy() for p in processes]
-
-    while completed < n:
-        idx = -1
-        min_bt = float('inf')
-        for i, p in enumerate(proc_list):
-            if p['AT'] <= time and not is_completed[i]:
-                if p['BT'] < min_bt:
-                    min_bt = p['BT']
-                    idx = i
-                elif p['BT'] == min_bt:
-                    if p['AT'] < proc_list[idx]['AT']:
-                        idx = i
-        if idx == -1:
-            time +=1
-        else:
-            p = proc_list[idx]
-            p['ST'] = time
-            p['CT'] = time + p['BT']
-            p['TAT'] = p['CT'] - p['AT']
-            p['WT'] = p['TAT'] - p['BT']
-            p['RT'] = p['ST'] - p['AT']
-            time = p['CT']
-            is_completed[idx] = True
-            completed +=1
-            gantt.append((p['PID'], p['ST'], p['CT']))
-
-    pid_map = {p['PID']: p for p in proc_list}
-    for p in processes:
-        p.update(pid_map[p['PID']])
-    return processes, gantt
-
-def srtf(processes):
-    n = len(processes)
-    proc_list = [p.copy() for p in processes]
-    remaining_bt = [p['BT'] for p in proc_list]
-    completed = 0
-    time = 0
-    start_time = [-1]*n
-    gantt = []
-    last_pid = None
-    timeline = []
-
-    while completed != n:
-        minm = float('inf')
-        shortest = None
-        for i in range(n):
-            if proc_list[i]['AT'] <= time and remaining_bt[i] > 0:
-                if remaining_bt[i] < minm:
-                    minm = remaining_bt[i]
-                    shortest = i
-                elif remaining_bt[i] == minm:
-                    if proc_list[i]['AT'] < proc_list[shortest]['AT']:
-                        shortest = i
-        if shortest is None:
-            time +=1
-            continue
-        if start_time[shortest] == -1:
-            start_time[shortest] = time
-        if last_pid != proc_list[shortest]['PID']:
-            timeline.append((proc_list[shortest]['PID'], time))
-            last_pid = proc_list[shortest]['PID']
-        remaining_bt[shortest] -= 1
-        time +=1
-        if remaining_bt[shortest] == 0:
-            completed +=1
-            proc_list[shortest]['CT'] = time
-            proc_list[shortest]['TAT'] = proc_list[shortest]['CT'] - proc_list[shortest]['AT']
-            proc_list[shortest]['WT'] = proc_list[shortest]['TAT'] - proc_list[shortest]['BT']
-            proc_list[shortest]['RT'] = start_time[shortest] - proc_list[shortest]['AT']
-
-    timeline.append(("END", time))
-    gantt = [(timeline[i][0], timeline[i][1], timeline[i+1][1]) for i in range(len(timeline)-1)]
-
-    pid_map = {p['PID']: p for p in proc_list}
-    for p in processes:
-        p.update(pid_map[p['PID']])
-    return processes, gantt
-
-def priority_non_preemptive(processes):
-    n = len(processes)
-    proc_list = [p.copy() for p in processes]
-    completed = 0
-    time = 0
-    is_completed = [False]*n
-    gantt = []
-
-    while completed < n:
-        idx = -1
-        highest_priority = float('inf')
-        for i, p in enumerate(proc_list):
-            if p['AT'] <= time and not is_completed[i]:
-                if p['Priority'] < highest_priority:
-                    highest_priority = p['Priority']
-                    idx = i
-                elif p['Priority'] == highest_priority:
-                    if p['AT'] < proc_list[idx]['AT']:
-                        idx = i
-        if idx == -1:
-            time +=1
-        else:
-            p = proc_list[idx]
-            p['ST'] = time
-            p['CT'] = time + p['BT']
-            p['TAT'] = p['CT'] - p['AT']
-            p['WT'] = p['TAT'] - p['BT']
-            p['RT'] = p['ST'] - p['AT']
-            time = p['CT']
-            is_completed[idx] = True
-            completed +=1
-            gantt.append((p['PID'], p['ST'], p['CT']))
-
-    pid_map = {p['PID']: p for p in proc_list}
-    for p in processes:
-        p.update(pid_map[p['PID']])
-    return processes, gantt
-
-def priority_preemptive(processes):
-    n = len(processes)
-    proc_list = [p.copy() for p in processes]
-    remaining_bt = [p['BT'] for p in proc_list]
-    completed = 0
-    time = 0
-    start_time = [-1]*n
-    gantt = []
-    last_pid = None
-    timeline = []
-
-    while completed != n:
-        idx = None
-        highest_priority = float('inf')
-        for i, p in enumerate(proc_list):
-            if p['AT'] <= time and remaining_bt[i] > 0:
-                if p['Priority'] < highest_priority:
-                    highest_priority = p['Priority']
-                    idx = i
-                elif p['Priority'] == highest_priority:
-                    if p['AT'] < proc_list[idx]['AT']:
-                        idx = i
-        if idx is None:
-            time +=1
-            continue
-        if start_time[idx] == -1:
-            start_time[idx] = time
-        if last_pid != proc_list[idx]['PID']:
-            timeline.append((proc_list[idx]['PID'], time))
-            last_pid = proc_list[idx]['PID']
-        remaining_bt[idx] -=1
-        time +=1
-        if remaining_bt[idx] ==0:
-            completed +=1
-            proc_list[idx]['CT'] = time
-            proc_list[idx]['TAT'] = proc_list[idx]['CT'] - proc_list[idx]['AT']
-            proc_list[idx]['WT'] = proc_list[idx]['TAT'] - proc_list[idx]['BT']
-            proc_list[idx]['RT'] = start_time[idx] - proc_list[idx]['AT']
-
-    timeline.append(("END", time))
-    gantt = [(timeline[i][0], timeline[i][1], timeline[i+1][1]) for i in range(len(timeline)-1)]
-
-    pid_map = {p['PID']: p for p in proc_list}
-    for p in processes:
-        p.update(pid_map[p['PID']])
-    return processes, gantt
-
-def round_robin(processes, quantum=2):
-    proc_list = [p.copy() for p in processes]
-    n = len(proc_list)
-    rem_bt = [p['BT'] for p in proc_list]
-    time = 0
-    queue = []
-    gantt = []
-
-    proc_list = sorted(proc_list, key=lambda x: x['AT'])
-    completed = 0
-    visited = [False]*n
-    start_time = [-1]*n
-
-    for i, p in enumerate(proc_list):
-        if p['AT'] <= time and not visited[i]:
-            queue.append(i)
-            visited[i] = True
-
-    while completed < n:
-        if not queue:
-            time +=1
-            for i, p in enumerate(proc_list):
-                if p['AT'] > time - 1 and p['AT'] <= time and not visited[i]:
-                    queue.append(i)
-                    visited[i] = True
-            continue
-        idx = queue.pop(0)
-        if start_time[idx] == -1:
-            start_time[idx] = time
-        exec_time = min(quantum, rem_bt[idx])
-        gantt.append((proc_list[idx]['PID'], time, time + exec_time))
-        time += exec_time
-        rem_bt[idx] -= exec_time
-
-        for i, p in enumerate(proc_list):
-            if p['AT'] > time - exec_time and p['AT'] <= time and not visited[i]:
-                queue.append(i)
-                visited[i] = True
-
-        if rem_bt[idx] ==0:
-            completed +=1
-            proc_list[idx]['CT'] = time
-            proc_list[idx]['TAT'] = proc_list[idx]['CT'] - proc_list[idx]['AT']
-            proc_list[idx]['WT'] = proc_list[idx]['TAT'] - proc_list[idx]['BT']
-            proc_list[idx]['RT'] = start_time[idx] - proc_list[idx]['AT']
-        else:
-            queue.append(idx)
-
-    pid_map = {p['PID']: p for p in proc_list}
-    for p in processes:
-        p.update(pid_map[p['PID']])
-    return processes, gantt
+from scheduler_cache import ResultCache
+from scheduler_core import (
+    AGING_CAP, AGING_INTERVAL, MULTICORE_ALGORITHMS, IncrementalScheduler, ProcessTable, RunProfile,
+    SchedulingCancelled, estimate_makespan, format_summary, multicore_schedule, schedule, summarize, summarize_cores
+)
+from scheduler_io import detect_format, import_processes
+from scheduler_trace import TraceReader, write_trace
+from scheduler_workload import ARRIVALS, BURSTS, generate_workload
+
+# GUI algorithm names mapped to scheduler_core.ALGORITHMS keys.
+ALGORITHM_FUNCTIONS = {
+    "FCFS": 'fcfs',
+    "SJF Non-Preemptive": 'sjf_non_preemptive',
+    "SRTF": 'srtf',
+    "Priority Non-Preemptive": 'priority_non_preemptive',
+    "Priority Preemptive": 'priority_preemptive',
+    "Round Robin": 'round_robin',
+    "CFS": 'cfs',
+    "MLFQ": 'mlfq',
+    "Priority Aging": 'priority_aging',
+}
+PRIORITY_ALGORITHMS = ["Priority Non-Preemptive", "Priority Preemptive", "CFS", "Priority Aging"]
+QUANTUM_ALGORITHMS = ["Round Robin", "MLFQ"]
+# MLFQ levels below the top get twice the quantum of the level above.
+MLFQ_LEVELS = 3
+# Run queue layouts offered for multi-core runs, as multicore_schedule() options.
+QUEUE_LAYOUTS = {
+    "Global queue": {'queues': 'global'},
+    "Per-core queues, work stealing": {'queues': 'per_core', 'steal': True},
+    "Per-core queues, no stealing": {'queues': 'per_core', 'steal': False},
+}
+TRACE_FILTER = "Scheduler traces (*.trc);;All files (*)"
+WORKLOAD_FILTER = "Workloads (*.csv *.jsonl *.ndjson);;All files (*)"
 
 # -------------------- Gantt Chart Canvas --------------------
 
 class GanttChartCanvas(FigureCanvas):
-    def __init__(self, gantt_data, parent=None):
-        fig = Figure(figsize=(8, 2))
+    # Above this many visible segments per pixel column the view is
+    # aggregated to one bar per column instead of drawing every segment.
+    MAX_SEGMENTS_PER_PIXEL = 1
+    MAX_LABELS = 200
+    MIN_TICK_SPACING = 40
+    # Multi-core charts grow by this many inches per core, up to MAX_HEIGHT,
+    # and name at most MAX_LANE_LABELS of their lanes.
+    LANE_HEIGHT = 0.3
+    MAX_HEIGHT = 6
+    MAX_LANE_LABELS = 32
+
+    def __init__(self, gantt_data, parent=None, per_core=False):
+        # gantt_data is a list of (pid, start, end) tuples or an (n, 3)
+        # array, such as the memory-mapped segments of a saved trace. With
+        # per_core it is a list of those, one per core, and every core gets
+        # a lane of its own, core 0 at the top.
+        self.gantt_data = gantt_data if gantt_data is not None else []
+        self.per_core = per_core
+        self.lanes = list(self.gantt_data) if per_core else [self.gantt_data]
+        self.segment_count = sum(len(lane) for lane in self.lanes)
+        height = min(self.MAX_HEIGHT, 1.5 + self.LANE_HEIGHT * len(self.lanes)) if per_core else 2
+        fig = Figure(figsize=(8, height))
         super().__init__(fig)
         self.setParent(parent)
         self.axes = fig.add_subplot(111)
-        self.gantt_data = gantt_data or []
+        self._view_artists = []
+        self._rendering = False
+        # Playback state: the simulated time shown, or None for the whole
+        # chart, and the cached backgrounds frames are blitted onto.
+        self.playback_time = None
+        self._base_background = None
+        self._revealed_background = None
+        self._revealed = None
+        self._play_bars = None
+        self._playhead = None
+        self.mpl_connect('resize_event', lambda event: self._render_view())
+        self.mpl_connect('draw_event', self._on_draw)
         self.draw_gantt()
 
+    @classmethod
+    def from_trace(cls, path, parent=None):
+        return cls(TraceReader(path).gantt, parent)
+
+    def _load_segments(self):
+        # Segments as sorted arrays, lane after lane, with back-to-back slices
+        # of the same PID (e.g. consecutive Round Robin quanta) merged into
+        # one bar. Lane i is _bounds[i]:_bounds[i + 1] of every array.
+        merged = []
+        for lane in self.lanes:
+            data = np.asarray(lane, dtype=np.int64).reshape(-1, 3)
+            pids, starts, ends = data[:, 0], data[:, 1], data[:, 2]
+            new_run = np.ones(len(pids), dtype=bool)
+            new_run[1:] = (pids[1:] != pids[:-1]) | (starts[1:] != ends[:-1])
+            first = np.flatnonzero(new_run)
+            last = np.append(first[1:] - 1, len(pids) - 1)
+            merged.append((pids[first], starts[first], ends[last]))
+        self._pids, self._starts, self._ends = (np.concatenate(column) for column in zip(*merged))
+        self._bounds = np.cumsum([0] + [len(pids) for pids, _, _ in merged]).tolist()
+        palette = to_rgba_array(matplotlib.rcParams['axes.prop_cycle'].by_key()['color'])
+        self._colors = palette[self._pids % len(palette)]
+        self._black = to_rgba_array('black')[0]
+
+    def _lane_y(self, lane):
+        return len(self.lanes) - 1 - lane
+
+    def _lane_range(self, lane, x0, x1):
+        # Indexes of lane's first and past-the-last segment overlapping x0..x1.
+        first, last = self._bounds[lane], self._bounds[lane + 1]
+        return (first + int(np.searchsorted(self._ends[first:last], x0, side='right')),
+                first + int(np.searchsorted(self._starts[first:last], x1, side='left')))
+
     def draw_gantt(self):
         ax = self.axes
         ax.clear()
+        self._view_artists = []
+        self._play_bars = self._playhead = None
         ax.set_title("Gantt Chart")
         ax.set_xlabel("Time")
         ax.set_yticks([])
         ax.grid(True, axis='x')
 
-        if not self.gantt_data:
+        if not self.segment_count:
             ax.text(0.5, 0.5, "No Gantt Data", ha='center', va='center')
             self.draw()
             return
 
         try:
-            for pid, start, end in self.gantt_data:
-                ax.barh(0, end - start, left=start, height=0.5, align='center', edgecolor='black')
-                ax.text((start + end)/2, 0, f"P{pid}", ha='center', va='center', color='white', fontweight='bold')
-
-            switch_times = sorted(set([start for _, start, _ in self.gantt_data] +
-                                      [end for _, _, end in self.gantt_data]))
-            ax.set_xticks(switch_times)
-            ax.set_xticklabels([str(t) for t in switch_times])
-            ax.set_xlim(0, max(switch_times))
-            ax.xaxis.grid(True, which='major')
-            self.draw()
+            self._load_segments()
+            ax.set_ylim(-0.5, len(self.lanes) - 0.5)
+            if self.per_core:
+                step = -(-len(self.lanes) // self.MAX_LANE_LABELS)
+                cores = range(0, len(self.lanes), step)
+                ax.set_yticks([self._lane_y(core) for core in cores])
+                ax.set_yticklabels([f"Core {core}" for core in cores], fontsize='small')
+            ax.set_xlim(0, self._ends.max())
+            # clear() drops axes callbacks, so reconnect after every reset.
+            ax.callbacks.connect('xlim_changed', lambda ax: self._render_view())
+            self._render_view()
         except Exception as e:
             print("Error drawing Gantt chart:", e)
             ax.text(0.5,0.5,"Error Drawing Gantt Chart",ha='center',va='center')
             self.draw()
 
+    def _aggregate(self, lo, hi, x0, x1, width_px):
+        # One sample per pixel column at its centre; runs of columns that
+        # show the same PID become a single bar. lo..hi lie in one lane.
+        edges = np.linspace(x0, x1, width_px + 1)
+        centres = (edges[:-1] + edges[1:]) / 2
+        starts, ends, pids = self._starts[lo:hi], self._ends[lo:hi], self._pids[lo:hi]
+        idx = np.searchsorted(starts, centres, side='right') - 1
+        covered = (idx >= 0) & (ends[np.maximum(idx, 0)] > centres)
+        column_pids = pids[np.maximum(idx, 0)]
+        change = np.ones(width_px, dtype=bool)
+        change[1:] = (column_pids[1:] != column_pids[:-1]) | (covered[1:] != covered[:-1])
+        first = np.flatnonzero(change)
+        last = np.append(first[1:], width_px)
+        keep = covered[first]
+        return edges[first[keep]], edges[last[keep]], column_pids[first[keep]], lo + idx[first[keep]]
+
+    def _render_view(self):
+        if self._rendering or not self.segment_count or not hasattr(self, '_starts'):
+            return
+        self._rendering = True
+        try:
+            ax = self.axes
+            for artist in self._view_artists:
+                artist.remove()
+            self._view_artists = []
+
+            x0, x1 = ax.get_xlim()
+            width_px = max(1, int(ax.get_window_extent().width))
+            time_per_px = (x1 - x0) / width_px
+            labels_left = self.MAX_LABELS
+            switch_times = []
+            bars = []
+            any_aggregated = False
+            for lane in range(len(self.lanes)):
+                lo, hi = self._lane_range(lane, x0, x1)
+                if hi <= lo:
+                    continue
+                y = self._lane_y(lane)
+                aggregated = hi - lo > width_px * self.MAX_SEGMENTS_PER_PIXEL
+                any_aggregated |= aggregated
+                if aggregated:
+                    starts, ends, pids, rows = self._aggregate(lo, hi, x0, x1, width_px)
+                else:
+                    starts, ends, pids = self._starts[lo:hi], self._ends[lo:hi], self._pids[lo:hi]
+                    rows = np.arange(lo, hi)
+
+                bars.append((lane, (starts, ends, rows, self._edge_colors(rows, aggregated))))
+
+                # Label only the bars wide enough for "P<pid>" at ~8 px a character.
+                if not aggregated:
+                    widths_px = (ends - starts) / time_per_px
+                    labelled = np.flatnonzero(widths_px >= 8 * (np.floor(np.log10(np.maximum(pids, 1))) + 2) + 4)
+                    if len(labelled) <= labels_left:
+                        labels_left -= len(labelled)
+                        for i in labelled:
+                            self._view_artists.append(ax.text((starts[i] + ends[i]) / 2, y, f"P{pids[i]}",
+                                                              ha='center', va='center', color='white',
+                                                              fontweight='bold',
+                                                              visible=self.playback_time is None))
+                switch_times += [starts, ends]
+            if bars:
+                collection = self._bar_collection(bars)
+                collection.set_visible(self.playback_time is None)
+                ax.add_collection(collection, autolim=False)
+                self._view_artists.append(collection)
+
+            # Tick every switch time when they fit, otherwise let matplotlib
+            # pick evenly spaced ticks.
+            switch_times = np.unique(np.concatenate(switch_times)) if switch_times else np.zeros(0)
+            switch_times = switch_times[(switch_times >= x0) & (switch_times <= x1)]
+            if not any_aggregated and len(switch_times) <= width_px / self.MIN_TICK_SPACING:
+                ax.set_xticks(switch_times)
+                ax.set_xticklabels([str(t) for t in switch_times.tolist()])
+            else:
+                ax.xaxis.set_major_locator(AutoLocator())
+                ax.xaxis.set_major_formatter(ScalarFormatter())
+            ax.xaxis.grid(True, which='major')
+            self.draw_idle()
+        finally:
+            self._rendering = False
+
+    # Playback reveals the chart up to a simulated time. A full draw with
+    # the bars hidden is cached as the background; each frame restores the
+    # background holding everything revealed so far, draws only the
+    # segments that finished since the last frame and caches that again,
+    # then blits the running segments and the playhead on top. Going back in
+    # time starts over from the empty background. Any full redraw (resize,
+    # zoom, pan) re-captures the backgrounds in _on_draw.
+
+    def playback_span(self):
+        if not self.segment_count or not hasattr(self, '_starts'):
+            return 0, 0
+        return int(self._starts.min()), int(self._ends.max())
+
+    def segment_at(self, t, lane=0):
+        # Index of the merged segment running at time t in a lane, or -1.
+        first, last = self._bounds[lane], self._bounds[lane + 1]
+        i = first + int(np.searchsorted(self._starts[first:last], t, side='right')) - 1
+        return i if i >= first and self._ends[i] > t else -1
+
+    def running_at(self, t):
+        # The PID running at time t in every lane, None where idle.
+        return [int(self._pids[i]) if i >= 0 else None
+                for i in (self.segment_at(t, lane) for lane in range(len(self.lanes)))]
+
+    def start_playback(self, t=None):
+        if not self.segment_count or not hasattr(self, '_starts'):
+            return
+        ax = self.axes
+        self.playback_time = self.playback_span()[0] if t is None else t
+        for artist in self._view_artists:
+            artist.set_visible(False)
+        if self._play_bars is None:
+            self._play_bars = [ax.add_patch(Rectangle((0, self._lane_y(lane) - 0.25), 0, 0.5, animated=True,
+                                                      edgecolor='black'))
+                               for lane in range(len(self.lanes))]
+            self._playhead = ax.axvline(self.playback_time, color='red', animated=True)
+        self._base_background = None
+        self.draw()
+
+    def stop_playback(self):
+        self.playback_time = None
+        self._base_background = self._revealed_background = None
+        for artist in self._view_artists:
+            artist.set_visible(True)
+        self.draw_idle()
+
+    def set_playback_time(self, t):
+        self.playback_time = t
+        if self._base_background is not None:
+            self._blit_frame(t)
+
+    def _on_draw(self, event):
+        if self.playback_time is None or self._play_bars is None:
+            return
+        self._base_background = self.copy_from_bbox(self.axes.bbox)
+        self._revealed_background = None
+        # Blitting repaints the widget, which must wait until this paint is over.
+        QTimer.singleShot(0, self._redraw_frame)
+
+    def _redraw_frame(self):
+        if self.playback_time is not None and self._base_background is not None:
+            self._blit_frame(self.playback_time)
+
+    def _revealed_bars(self, lane, lo, hi):
+        # (starts, ends, rows, edge colours) of the bars for a lane's
+        # segments lo..hi-1, at most one per pixel column as in _render_view().
+        ax = self.axes
+        x0, x1 = ax.get_xlim()
+        view_lo, view_hi = self._lane_range(lane, x0, x1)
+        lo, hi = max(lo, view_lo), min(hi, view_hi)
+        if hi <= lo:
+            return None
+        view_px = max(1, int(ax.get_window_extent().width))
+        time_per_px = (x1 - x0) / view_px
+        # Aggregate whenever the whole view is, on the view's own pixel
+        # columns, so the finished playback looks like the static chart.
+        aggregated = view_hi - view_lo > view_px * self.MAX_SEGMENTS_PER_PIXEL
+        if aggregated:
+            first_px = int((max(self._starts[lo], x0) - x0) // time_per_px)
+            last_px = min(view_px, int(np.ceil((min(self._ends[hi - 1], x1) - x0) / time_per_px)))
+            starts, ends, _, rows = self._aggregate(lo, hi, x0 + first_px * time_per_px, x0 + last_px * time_per_px,
+                                                    max(1, last_px - first_px))
+        else:
+            starts, ends, rows = self._starts[lo:hi], self._ends[lo:hi], np.arange(lo, hi)
+        return starts, ends, rows, self._edge_colors(rows, aggregated)
+
+    def _draw_revealed(self, ranges):
+        # Draws the segments of every (lane, lo, hi) range once, straight
+        # onto the canvas.
+        bars = []
+        for lane, lo, hi in ranges:
+            found = self._revealed_bars(lane, lo, hi)
+            if found is not None:
+                bars.append((lane, found))
+        if bars:
+            collection = self._bar_collection(bars)
+            collection.set_animated(True)
+            self.axes.add_collection(collection, autolim=False)
+            self.axes.draw_artist(collection)
+            collection.remove()
+
+    def _edge_colors(self, rows, aggregated):
+        # Aggregated bars are outlined in their own colour so that columns
+        # of them read as one.
+        return self._colors[rows] if aggregated else np.broadcast_to(self._black, (len(rows), 4))
+
+    def _bar_collection(self, bars):
+        # All the bars of every lane in one collection, which draws far
+        # faster than a broken_barh per lane. bars holds (lane, (starts,
+        # ends, rows, edge colours)) pairs.
+        starts, ends, rows, edges = (np.concatenate(column) for column in zip(*(found for _, found in bars)))
+        bottoms = np.concatenate([np.full(len(found[0]), self._lane_y(lane) - 0.25) for lane, found in bars])
+        corners = np.stack([np.column_stack(corner) for corner in
+                            ((starts, bottoms), (starts, bottoms + 0.5), (ends, bottoms + 0.5), (ends, bottoms))],
+                           axis=1)
+        return PolyCollection(corners, facecolors=self._colors[rows], edgecolors=edges)
+
+    def _blit_frame(self, t):
+        ax = self.axes
+        # Per lane, the index past the last segment finished by t.
+        done = [first + int(np.searchsorted(self._ends[first:last], t, side='right'))
+                for first, last in zip(self._bounds, self._bounds[1:])]
+        if self._revealed_background is None or any(d < r for d, r in zip(done, self._revealed)):
+            self.restore_region(self._base_background)
+            self._revealed = self._bounds[:-1]
+        else:
+            self.restore_region(self._revealed_background)
+        if done != self._revealed or self._revealed_background is None:
+            self._draw_revealed([(lane, revealed, finished)
+                                 for lane, (revealed, finished) in enumerate(zip(self._revealed, done))
+                                 if finished > revealed])
+            self._revealed_background = self.copy_from_bbox(ax.bbox)
+            self._revealed = done
+        for lane, bar in enumerate(self._play_bars):
+            i = done[lane]
+            if i < self._bounds[lane + 1] and self._starts[i] < t:
+                bar.set_bounds(self._starts[i], self._lane_y(lane) - 0.25, t - self._starts[i], 0.5)
+                bar.set_facecolor(self._colors[i])
+                ax.draw_artist(bar)
+        self._playhead.set_xdata([t, t])
+        ax.draw_artist(self._playhead)
+        self.blit(ax.bbox)
+
+class GanttPlayer(QWidget):
+    # Play/pause, scrub and speed controls for a GanttChartCanvas, with the
+    # running process and ready queue at the current time. At 1x the whole
+    # schedule plays in PLAY_SECONDS; frames advance by wall time, so the
+    # speed does not depend on the frame rate.
+    SPEEDS = (0.25, 0.5, 1, 2, 4, 8, 16)
+    PLAY_SECONDS = 20
+    FRAME_MS = 16
+    SLIDER_STEPS = 1000
+    MAX_READY_SHOWN = 20
+
+    def __init__(self, canvas, processes, parent=None):
+        super().__init__(parent)
+        self.canvas = canvas
+        self.t0, self.t1 = canvas.playback_span()
+        self.time = self.t0
+        self._last_tick = None
+        # Arrival-ordered columns for the ready-queue readout.
+        order = np.argsort(processes['AT'], kind='stable')
+        self._pids = processes['PID'][order]
+        self._arrivals = processes['AT'][order]
+        self._finishes = processes['CT'][order]
+        self.timer = QTimer(self)
+        self.timer.setInterval(self.FRAME_MS)
+        self.timer.timeout.connect(self._tick)
+        self.initUI()
+
+    def initUI(self):
+        layout = QVBoxLayout()
+        controls = QHBoxLayout()
+        self.play_btn = QPushButton("Play")
+        self.play_btn.clicked.connect(self.toggle)
+        controls.addWidget(self.play_btn)
+        self.show_all_btn = QPushButton("Show All")
+        self.show_all_btn.clicked.connect(self.show_all)
+        controls.addWidget(self.show_all_btn)
+        self.slider = QSlider(Qt.Horizontal)
+        self.slider.setRange(0, self.SLIDER_STEPS)
+        self.slider.valueChanged.connect(self._scrubbed)
+        controls.addWidget(self.slider, 1)
+        self.speed_box = QComboBox()
+        self.speed_box.addItems([f"{speed:g}x" for speed in self.SPEEDS])
+        self.speed_box.setCurrentIndex(self.SPEEDS.index(1))
+        controls.addWidget(self.speed_box)
+        self.time_label = QLabel()
+        controls.addWidget(self.time_label)
+        layout.addLayout(controls)
+        self.queue_label = QLabel()
+        self.queue_label.setStyleSheet("font-family: monospace;")
+        # Long readouts are cut off rather than widening the window.
+        self.queue_label.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Preferred)
+        layout.addWidget(self.queue_label)
+        self.setLayout(layout)
+        self.setEnabled(self.t1 > self.t0)
+        self._update_labels()
+
+    @property
+    def speed(self):
+        return self.SPEEDS[self.speed_box.currentIndex()]
+
+    def toggle(self):
+        if self.timer.isActive():
+            self.pause()
+        else:
+            self.play()
+
+    def play(self):
+        if self.time >= self.t1:
+            self.time = self.t0
+        if self.canvas.playback_time is None:
+            self.canvas.start_playback(self.time)
+        self._last_tick = time.perf_counter()
+        self.timer.start()
+        self.play_btn.setText("Pause")
+
+    def pause(self):
+        self.timer.stop()
+        self.play_btn.setText("Play")
+
+    def show_all(self):
+        self.pause()
+        self.time = self.t0
+        self.canvas.stop_playback()
+        self._sync_slider()
+        self._update_labels()
+
+    def seek(self, t):
+        self.time = min(max(t, self.t0), self.t1)
+        if self.canvas.playback_time is None:
+            self.canvas.start_playback(self.time)
+        else:
+            self.canvas.set_playback_time(self.time)
+        self._sync_slider()
+        self._update_labels()
+
+    def _tick(self):
+        now = time.perf_counter()
+        rate = (self.t1 - self.t0) / self.PLAY_SECONDS * self.speed
+        self.seek(self.time + (now - self._last_tick) * rate)
+        self._last_tick = now
+        if self.time >= self.t1:
+            self.pause()
+
+    def _scrubbed(self, value):
+        self.seek(self.t0 + (self.t1 - self.t0) * value / self.SLIDER_STEPS)
+
+    def _sync_slider(self):
+        self.slider.blockSignals(True)
+        span = self.t1 - self.t0
+        self.slider.setValue(round(self.SLIDER_STEPS * (self.time - self.t0) / span) if span else 0)
+        self.slider.blockSignals(False)
+
+    def ready_queue(self, t):
+        # (PIDs running, one per busy core, and PIDs that have arrived and
+        # are neither finished nor running, in arrival order).
+        arrived = int(np.searchsorted(self._arrivals, t, side='right'))
+        waiting = self._pids[:arrived][self._finishes[:arrived] > t]
+        # A preemptive segment runs on over idle time, so a process only
+        # counts as running if it is still unfinished.
+        running = [pid for pid in self.canvas.running_at(t) if pid is not None and (waiting == pid).any()]
+        return running, waiting[~np.isin(waiting, running)]
+
+    def _update_labels(self):
+        self.time_label.setText(f"t = {int(self.time)} / {self.t1}")
+        if self.canvas.playback_time is None:
+            self.queue_label.setText("")
+            return
+        running, waiting = self.ready_queue(self.time)
+        self.queue_label.setText(f"Running: {self._pid_list(running) or 'idle'}    "
+                                 f"Ready ({len(waiting)}, by arrival): {self._pid_list(waiting.tolist())}")
+
+    def _pid_list(self, pids):
+        shown = ' '.join(f"P{pid}" for pid in pids[:self.MAX_READY_SHOWN])
+        more = f" +{len(pids) - self.MAX_READY_SHOWN} more" if len(pids) > self.MAX_READY_SHOWN else ""
+        return shown + more
+
+# -------------------- Table Models --------------------
+
+# Column widths are fitted to this many rows instead of every row.
+COLUMN_WIDTH_SAMPLE_ROWS = 200
+
+def setup_table_view(view, model):
+    view.setModel(model)
+    view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+    view.horizontalHeader().setResizeContentsPrecision(COLUMN_WIDTH_SAMPLE_ROWS)
+    view.resizeColumnsToContents()
+
+class ProcessTableModel(QAbstractTableModel):
+    # Reads cells straight out of a ProcessTable, so only the rows Qt
+    # actually paints are ever turned into strings.
+    def __init__(self, table, columns, parent=None):
+        super().__init__(parent)
+        self.table = table
+        self.columns = columns
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.table)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        name = self.columns[index.column()][1]
+        if name == 'Priority' and not self.table.has_priority:
+            return '-'
+        return str(self.table[name][index.row()])
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.columns[section][0]
+        return super().headerData(section, orientation, role)
+
+class ProcessListModel(QAbstractTableModel):
+    # Model over the list of process dicts being entered; new processes are
+    # inserted as rows instead of rebuilding the whole table. Every column
+    # but PID can be edited in place.
+    MINIMUM = {'AT': 0, 'BT': 1, 'Priority': None}
+
+    def __init__(self, processes, columns, parent=None):
+        super().__init__(parent)
+        self.processes = processes
+        self.columns = columns
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.processes)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role not in (Qt.DisplayRole, Qt.EditRole) or not index.isValid():
+            return None
+        value = self.processes[index.row()].get(self.columns[index.column()][1], '-')
+        return str(value) if role == Qt.DisplayRole else value
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.isValid() and self.columns[index.column()][1] in self.MINIMUM:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def setData(self, index, value, role=Qt.EditRole):
+        name = self.columns[index.column()][1]
+        if role != Qt.EditRole or name not in self.MINIMUM:
+            return False
+        try:
+            value = int(value)
+        except (TypeError, ValueError):
+            return False
+        if self.MINIMUM[name] is not None and value < self.MINIMUM[name]:
+            return False
+        self.processes[index.row()][name] = value
+        self.dataChanged.emit(index, index)
+        return True
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.columns[section][0]
+        return super().headerData(section, orientation, role)
+
+    def append(self, processes):
+        if not processes:
+            return
+        first = len(self.processes)
+        self.beginInsertRows(QModelIndex(), first, first + len(processes) - 1)
+        self.processes.extend(processes)
+        self.endInsertRows()
+
+    def remove(self, rows):
+        for row in sorted(set(rows), reverse=True):
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self.processes[row]
+            self.endRemoveRows()
+
+    def reset(self):
+        self.beginResetModel()
+        self.endResetModel()
+
+# -------------------- Background Worker --------------------
+
+class SchedulerWorker(QThread):
+    # Runs one algorithm off the UI thread. Progress is reported in
+    # thousandths of the estimated makespan. With an IncrementalScheduler
+    # only the part of the schedule after the first edit is simulated again.
+    # The RunProfile, if one was asked for, is sent along with the results.
+    progressed = Signal(int)
+    completed = Signal(object, object, object)
+    failed = Signal(str)
+
+    def __init__(self, algorithm, table, quantum, cache=None, incremental=None, params=None, profile=None,
+                 parent=None):
+        super().__init__(parent)
+        self.algorithm = algorithm
+        self.table = table
+        self.quantum = quantum
+        self.params = params or {}
+        self.cache = cache
+        self.incremental = incremental
+        self.profile = profile
+        self.makespan = estimate_makespan(table, self.params.get('cores', 1))
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def _report(self, time):
+        if self.cancelled:
+            raise SchedulingCancelled()
+        self.progressed.emit(min(999, int(1000 * time / self.makespan)) if self.makespan else 0)
+
+    def run(self):
+        try:
+            simulate = self.incremental.run if self.incremental is not None else None
+            if self.params.get('cores', 1) > 1:
+                table, gantt = multicore_schedule(self.algorithm, self.table, quantum=self.quantum,
+                                                  progress=self._report, profile=self.profile, **self.params)
+            elif self.cache is not None:
+                table, gantt = self.cache.schedule(self.algorithm, self.table, self.quantum,
+                                                   self._report, simulate, self.profile, **self.params)
+            elif simulate is not None:
+                table, gantt = simulate(self.table, self._report, self.profile)
+            else:
+                table, gantt = schedule(self.algorithm, self.table, quantum=self.quantum,
+                                        progress=self._report, profile=self.profile, **self.params)
+        except SchedulingCancelled:
+            return
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        if not self.cancelled:
+            self.completed.emit(table, gantt, self.profile)
+
 # -------------------- Screens --------------------
 
 class ResultScreen(QWidget):
-    def __init__(self, processes, gantt_data, algorithm, on_back):
+    # params are the algorithm options saved in a trace header: the quantum
+    # for Round Robin, the keyword options for CFS, MLFQ and Priority Aging.
+    # Multi-core runs add their multicore_schedule() options, and their
+    # gantt_data is one gantt per core.
+    def __init__(self, processes, gantt_data, algorithm, on_back, profile=None, params=None,
+                 back_text="Back to Process Input"):
         super().__init__()
+        if not isinstance(processes, ProcessTable):
+            processes = ProcessTable.from_dicts(processes)
+            processes.compute_metrics()
         self.processes = processes
         self.gantt_data = gantt_data
         self.algorithm = algorithm
         self.on_back = on_back
+        self.profile = profile
+        self.params = params or {}
+        self.cores = self.params.get('cores', 1)
+        self.back_text = back_text
         self.initUI()
 
+    @classmethod
+    def from_trace(cls, path, on_back, back_text="Back to Process Input"):
+        # Shows a saved trace without running anything.
+        reader = TraceReader(path)
+        name = next((gui for gui, core in ALGORITHM_FUNCTIONS.items() if core == reader.algorithm),
+                    reader.algorithm)
+        return cls(reader.table(), reader.gantt, name, on_back, params=reader.params, back_text=back_text)
+
     def initUI(self):
         layout = QVBoxLayout()
         title = QLabel(f"Results - {self.algorithm}")
@@ -308,49 +715,129 @@ class ResultScreen(QWidget):
         title.setStyleSheet("font-size: 20pt; font-weight: bold;")
         layout.addWidget(title)
 
-        table = QTableWidget()
-        table.setColumnCount(7)
-        table.setHorizontalHeaderLabels(['PID', 'AT', 'BT', 'Priority', 'CT', 'TAT', 'WT'])
-        table.setRowCount(len(self.processes))
-        for i, p in enumerate(self.processes):
-            table.setItem(i,0,QTableWidgetItem(str(p['PID'])))
-            table.setItem(i,1,QTableWidgetItem(str(p['AT'])))
-            table.setItem(i,2,QTableWidgetItem(str(p['BT'])))
-            table.setItem(i,3,QTableWidgetItem(str(p.get('Priority','-'))))
-            table.setItem(i,4,QTableWidgetItem(str(p.get('CT','-'))))
-            table.setItem(i,5,QTableWidgetItem(str(p.get('TAT','-'))))
-            table.setItem(i,6,QTableWidgetItem(str(p.get('WT','-'))))
-        table.resizeColumnsToContents()
+        table = QTableView()
+        columns = [('PID', 'PID'), ('AT', 'AT'), ('BT', 'BT'), ('Priority', 'Priority'),
+                   ('CT', 'CT'), ('TAT', 'TAT'), ('WT', 'WT'), ('RT', 'RT')]
+        setup_table_view(table, ProcessTableModel(self.processes, columns, self))
         layout.addWidget(table)
 
-        total_tat = sum(p.get('TAT',0) for p in self.processes)
-        total_wt = sum(p.get('WT',0) for p in self.processes)
-        n = len(self.processes)
-        avg_tat = total_tat / n if n else 0
-        avg_wt = total_wt / n if n else 0
-
-        avg_label = QLabel(f"Average Turnaround Time (TAT): {avg_tat:.2f}    Average Waiting Time (WT): {avg_wt:.2f}")
+        if self.cores > 1:
+            self.summary = summarize_cores(self.processes, self.gantt_data)
+        else:
+            self.summary = summarize(self.processes, self.gantt_data)
+        avg_label = QLabel(f"Average Turnaround Time (TAT): {self.summary['AvgTAT']:.2f}    "
+                           f"Average Waiting Time (WT): {self.summary['AvgWT']:.2f}")
         avg_label.setAlignment(Qt.AlignCenter)
         avg_label.setStyleSheet("font-size: 14pt; font-weight: bold; margin: 10px;")
         layout.addWidget(avg_label)
 
-        gantt_chart = GanttChartCanvas(self.gantt_data)
+        summary_box = QGroupBox("Metrics")
+        summary_layout = QVBoxLayout()
+        summary_label = QLabel(format_summary(self.summary))
+        summary_label.setStyleSheet("font-family: monospace;")
+        summary_layout.addWidget(summary_label)
+        summary_box.setLayout(summary_layout)
+        layout.addWidget(summary_box)
+
+        if self.profile is not None:
+            profile_box = QGroupBox("Run Profile")
+            profile_layout = QVBoxLayout()
+            profile_label = QLabel(self.profile.format())
+            profile_label.setStyleSheet("font-family: monospace;")
+            profile_layout.addWidget(profile_label)
+            profile_box.setLayout(profile_layout)
+            layout.addWidget(profile_box)
+
+        gantt_chart = GanttChartCanvas(self.gantt_data, per_core=self.cores > 1)
         gantt_chart.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
         layout.addWidget(gantt_chart)
+        layout.addWidget(NavigationToolbar(gantt_chart, self))
+        self.player = GanttPlayer(gantt_chart, self.processes)
+        layout.addWidget(self.player)
 
-        back_btn = QPushButton("Back to Process Input")
+        # Traces hold a single CPU's gantt.
+        if self.cores == 1:
+            save_btn = QPushButton("Save Trace...")
+            save_btn.clicked.connect(self.save_trace)
+            layout.addWidget(save_btn)
+
+        back_btn = QPushButton(self.back_text)
         back_btn.clicked.connect(self.on_back)
         layout.addWidget(back_btn)
         self.setLayout(layout)
 
+    def save_trace(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Save Trace", "", TRACE_FILTER)
+        if not path:
+            return
+        try:
+            write_trace(path, self.processes, self.gantt_data,
+                        ALGORITHM_FUNCTIONS.get(self.algorithm, self.algorithm), **self.params)
+        except OSError as e:
+            QMessageBox.warning(self, "Error", f"Could not save trace: {e}")
+
+class WorkloadDialog(QDialog):
+    # Options for scheduler_workload.generate_workload().
+    MAX_PROCESSES = 1000000
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Generate Workload")
+        form = QFormLayout()
+        self.count_input = QSpinBox()
+        self.count_input.setRange(1, self.MAX_PROCESSES)
+        self.count_input.setValue(100)
+        form.addRow("Processes:", self.count_input)
+        self.arrivals_box = QComboBox()
+        self.arrivals_box.addItems(ARRIVALS)
+        form.addRow("Arrivals:", self.arrivals_box)
+        self.bursts_box = QComboBox()
+        self.bursts_box.addItems(BURSTS)
+        form.addRow("Burst times:", self.bursts_box)
+        self.scale_input = QDoubleSpinBox()
+        self.scale_input.setRange(1, 100000)
+        self.scale_input.setValue(10)
+        form.addRow("Mean burst time:", self.scale_input)
+        self.load_input = QDoubleSpinBox()
+        self.load_input.setRange(0.05, 10)
+        self.load_input.setSingleStep(0.05)
+        self.load_input.setValue(0.9)
+        form.addRow("Offered load:", self.load_input)
+        self.seed_input = QSpinBox()
+        self.seed_input.setRange(0, 2**31 - 1)
+        form.addRow("Seed:", self.seed_input)
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        form.addRow(buttons)
+        self.setLayout(form)
+
+    def options(self):
+        return self.count_input.value(), {
+            'arrivals': self.arrivals_box.currentText(),
+            'bursts': self.bursts_box.currentText(),
+            'burst_scale': self.scale_input.value(),
+            'load': self.load_input.value(),
+            'seed': self.seed_input.value(),
+        }
+
 class ProcessInputScreen(QWidget):
-    def __init__(self, on_back, on_run, selected_algo):
+    # Import problems listed in the warning itself; the rest are under
+    # "Show Details...".
+    SHOWN_IMPORT_ERRORS = 10
+
+    def __init__(self, on_back, on_run, selected_algo, cache=None):
         super().__init__()
         self.on_back = on_back
         self.on_run = on_run
         self.selected_algo = selected_algo
+        self.cache = cache
         self.processes = []
         self.pid_counter = 1
+        self.worker = None
+        # Kept across runs so that after adding, removing or editing a few
+        # processes only the schedule from the first change on is redone.
+        self.incremental = None
         self.initUI()
 
     def initUI(self):
@@ -373,41 +860,94 @@ class ProcessInputScreen(QWidget):
         form_layout.addWidget(QLabel("Burst Time (BT):"), 1, 0)
         form_layout.addWidget(self.burst_input, 1, 1)
 
-        # Priority input for Priority algorithms
+        # Priority input for Priority algorithms; CFS reads it as a nice value
         self.priority_input = QSpinBox()
         self.priority_input.setRange(1, 1000)
         self.priority_input.setButtonSymbols(QSpinBox.NoButtons)
-        if self.selected_algo in ["Priority Non-Preemptive", "Priority Preemptive"]:
-            form_layout.addWidget(QLabel("Priority:"), 2, 0)
+        priority_label = "Priority:"
+        if self.selected_algo == "CFS":
+            self.priority_input.setRange(-20, 19)
+            self.priority_input.setValue(0)
+            priority_label = "Nice (-20 to 19):"
+        if self.selected_algo in PRIORITY_ALGORITHMS:
+            form_layout.addWidget(QLabel(priority_label), 2, 0)
             form_layout.addWidget(self.priority_input, 2, 1)
 
-        # Time Quantum input for Round Robin
+        # Time Quantum input for Round Robin and the top MLFQ level
         self.quantum_input = QSpinBox()
         self.quantum_input.setRange(1, 1000)
         self.quantum_input.setButtonSymbols(QSpinBox.NoButtons)
-        if self.selected_algo == "Round Robin":
+        if self.selected_algo in QUANTUM_ALGORITHMS:
             form_layout.addWidget(QLabel("Time Quantum:"), 2, 0)
             form_layout.addWidget(self.quantum_input, 2, 1)
 
+        # Aging options: time waited per level gained, and the most levels
+        self.aging_interval_input = QSpinBox()
+        self.aging_interval_input.setRange(1, 100000)
+        self.aging_interval_input.setValue(AGING_INTERVAL)
+        self.aging_interval_input.setButtonSymbols(QSpinBox.NoButtons)
+        self.aging_cap_input = QSpinBox()
+        self.aging_cap_input.setRange(0, 1000)
+        self.aging_cap_input.setValue(AGING_CAP)
+        self.aging_cap_input.setButtonSymbols(QSpinBox.NoButtons)
+        self.preemptive_check = QCheckBox("Preemptive")
+        self.preemptive_check.setChecked(True)
+        if self.selected_algo == "Priority Aging":
+            form_layout.addWidget(QLabel("Aging Interval:"), 3, 0)
+            form_layout.addWidget(self.aging_interval_input, 3, 1)
+            form_layout.addWidget(QLabel("Aging Cap (levels):"), 4, 0)
+            form_layout.addWidget(self.aging_cap_input, 4, 1)
+            form_layout.addWidget(self.preemptive_check, 5, 1)
+
+        # CPU cores, and how a multi-core run lays out its run queues
+        self.cores_input = QSpinBox()
+        self.cores_input.setRange(1, 256)
+        self.cores_input.setButtonSymbols(QSpinBox.NoButtons)
+        self.queues_box = QComboBox()
+        self.queues_box.addItems(list(QUEUE_LAYOUTS))
+        if ALGORITHM_FUNCTIONS.get(self.selected_algo) in MULTICORE_ALGORITHMS:
+            form_layout.addWidget(QLabel("CPU Cores:"), 3, 0)
+            form_layout.addWidget(self.cores_input, 3, 1)
+            form_layout.addWidget(QLabel("Run Queues:"), 4, 0)
+            form_layout.addWidget(self.queues_box, 4, 1)
+
         layout.addLayout(form_layout)
 
         add_btn = QPushButton("Add Process")
         add_btn.clicked.connect(self.add_process)
         layout.addWidget(add_btn)
 
-        self.table = QTableWidget()
-        self.table.setColumnCount(
-            4 if self.selected_algo in ["Priority Non-Preemptive", "Priority Preemptive"] else 3
-        )
-        headers = ['PID', 'Arrival Time', 'Burst Time']
-        if self.selected_algo in ["Priority Non-Preemptive", "Priority Preemptive"]:
-            headers.append('Priority')
-        self.table.setHorizontalHeaderLabels(headers)
+        workload_layout = QHBoxLayout()
+        generate_btn = QPushButton("Generate Workload...")
+        generate_btn.clicked.connect(self.generate_workload)
+        workload_layout.addWidget(generate_btn)
+        import_btn = QPushButton("Import Workload...")
+        import_btn.clicked.connect(self.import_workload)
+        workload_layout.addWidget(import_btn)
+        paste_btn = QPushButton("Paste Workload")
+        paste_btn.clicked.connect(self.paste_workload)
+        workload_layout.addWidget(paste_btn)
+        layout.addLayout(workload_layout)
+
+        self.table = QTableView()
+        columns = [('PID', 'PID'), ('Arrival Time', 'AT'), ('Burst Time', 'BT')]
+        if self.selected_algo in PRIORITY_ALGORITHMS:
+            columns.append(('Nice' if self.selected_algo == "CFS" else 'Priority', 'Priority'))
+        self.process_model = ProcessListModel(self.processes, columns, self)
+        setup_table_view(self.table, self.process_model)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
         layout.addWidget(self.table)
 
-        run_btn = QPushButton("Run Scheduler")
-        run_btn.clicked.connect(self.run_scheduler)
-        layout.addWidget(run_btn)
+        remove_btn = QPushButton("Remove Selected")
+        remove_btn.clicked.connect(self.remove_selected)
+        layout.addWidget(remove_btn)
+
+        self.profile_check = QCheckBox("Collect run profile")
+        layout.addWidget(self.profile_check)
+
+        self.run_btn = QPushButton("Run Scheduler")
+        self.run_btn.clicked.connect(self.run_scheduler)
+        layout.addWidget(self.run_btn)
 
         back_btn = QPushButton("Back to Algorithm Selection")
         back_btn.clicked.connect(self.on_back)
@@ -420,7 +960,7 @@ class ProcessInputScreen(QWidget):
         bt = self.burst_input.value()
         p = {'PID': self.pid_counter, 'AT': at, 'BT': bt}
 
-        if self.selected_algo in ["Priority Non-Preemptive", "Priority Preemptive"]:
+        if self.selected_algo in PRIORITY_ALGORITHMS:
             p['Priority'] = self.priority_input.value()
 
         if bt <= 0:
@@ -430,24 +970,79 @@ class ProcessInputScreen(QWidget):
             QMessageBox.warning(self, "Invalid Input", "Arrival time cannot be negative")
             return
 
-        # If Round Robin, after first process disable quantum input
-        if self.selected_algo == "Round Robin" and self.pid_counter == 1:
+        self.freeze_quantum()
+        self.pid_counter += 1
+        self.process_model.append([p])
+
+    def freeze_quantum(self):
+        # If Round Robin or MLFQ, after first process disable quantum input
+        if self.selected_algo in QUANTUM_ALGORITHMS and self.pid_counter == 1:
             self.quantum_value = self.quantum_input.value()
             self.quantum_input.setDisabled(True)
             self.quantum_input.setStyleSheet("background-color: rgba(255, 255, 255, 0.9);")
 
-        self.processes.append(p)
-        self.pid_counter += 1
-        self.update_table()
+    def generate_workload(self):
+        dialog = WorkloadDialog(self)
+        if dialog.exec_() != QDialog.Accepted:
+            return
+        n, options = dialog.options()
+        table = generate_workload(n, first_pid=self.pid_counter, **options)
+        if self.selected_algo == "CFS":
+            # Zipf ranks from 1 become nice values from 0, mostly 0.
+            table['Priority'] = table['Priority'] - 1
+        self.append_table(table)
+
+    def import_workload(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Import Workload", "", WORKLOAD_FILTER)
+        if not path:
+            return
+        try:
+            with open(path, newline='') as f:
+                self.import_stream(f, detect_format(path))
+        except (OSError, ValueError, csv.Error) as e:
+            QMessageBox.warning(self, "Error", f"Could not import {path}: {e}")
+
+    def paste_workload(self):
+        text = QApplication.clipboard().text()
+        if not text.strip():
+            QMessageBox.warning(self, "Nothing to Paste", "The clipboard holds no text.")
+            return
+        # JSON lines start with an object; anything else is read as CSV.
+        fmt = 'jsonl' if text.lstrip().startswith('{') else 'csv'
+        try:
+            self.import_stream(io.StringIO(text, newline=''), fmt)
+        except (ValueError, csv.Error) as e:
+            QMessageBox.warning(self, "Error", f"Could not import the clipboard: {e}")
+
+    def import_stream(self, stream, fmt):
+        # Adds the rows that pass validation in one batch and lists every
+        # line that did not.
+        table, errors = import_processes(stream, fmt, self.selected_algo in PRIORITY_ALGORITHMS,
+                                         [p['PID'] for p in self.processes])
+        self.append_table(table)
+        if not errors:
+            return
+        problems = [f"Line {line}: {message}" for line, message in errors]
+        skipped = len({line for line, _ in errors})
+        box = QMessageBox(QMessageBox.Warning, "Import Problems",
+                          f"Imported {len(table)} processes and skipped {skipped} rows.", parent=self)
+        box.setInformativeText("\n".join(problems[:self.SHOWN_IMPORT_ERRORS])
+                               + ("\n..." if len(problems) > self.SHOWN_IMPORT_ERRORS else ""))
+        box.setDetailedText("\n".join(problems))
+        box.exec_()
+
+    def append_table(self, table):
+        # Adds a ProcessTable's rows as one insertion into the model.
+        if not len(table):
+            return
+        names = ['PID', 'AT', 'BT'] + (['Priority'] if self.selected_algo in PRIORITY_ALGORITHMS else [])
+        self.freeze_quantum()
+        self.pid_counter = max(self.pid_counter, int(table['PID'].max()) + 1)
+        self.process_model.append([dict(zip(names, row)) for row in table.rows(names)])
 
-    def update_table(self):
-        self.table.setRowCount(len(self.processes))
-        for i, p in enumerate(self.processes):
-            self.table.setItem(i, 0, QTableWidgetItem(str(p['PID'])))
-            self.table.setItem(i, 1, QTableWidgetItem(str(p['AT'])))
-            self.table.setItem(i, 2, QTableWidgetItem(str(p['BT'])))
-            if self.selected_algo in ["Priority Non-Preemptive", "Priority Preemptive"]:
-                self.table.setItem(i, 3, QTableWidgetItem(str(p.get('Priority', '-'))))
+    def remove_selected(self):
+        rows = [index.row() for index in self.table.selectionModel().selectedRows()]
+        self.process_model.remove(rows)
 
     def run_scheduler(self):
         if not self.processes:
@@ -455,26 +1050,61 @@ class ProcessInputScreen(QWidget):
             return
 
         algo = self.selected_algo
-        procs = [p.copy() for p in self.processes]
-
-        if algo == "FCFS":
-            procs, gantt = fcfs(procs)
-        elif algo == "SJF Non-Preemptive":
-            procs, gantt = sjf_non_preemptive(procs)
-        elif algo == "SRTF":
-            procs, gantt = srtf(procs)
-        elif algo == "Priority Non-Preemptive":
-            procs, gantt = priority_non_preemptive(procs)
-        elif algo == "Priority Preemptive":
-            procs, gantt = priority_preemptive(procs)
-        elif algo == "Round Robin":
-            quantum = getattr(self, 'quantum_value', 2)  # Use stored quantum from first process
-            procs, gantt = round_robin(procs, quantum=quantum)
-        else:
+        if algo not in ALGORITHM_FUNCTIONS:
             QMessageBox.warning(self, "Error", f"Algorithm {algo} not supported.")
             return
-
-        self.on_run(procs, gantt, algo)
+        table = ProcessTable.from_dicts(self.processes)
+        quantum = getattr(self, 'quantum_value', 2)  # Use stored quantum from first process
+
+        params = {}
+        if algo == "MLFQ":
+            params['quanta'] = tuple(quantum << level for level in range(MLFQ_LEVELS))
+        elif algo == "Priority Aging":
+            params = {'aging_interval': self.aging_interval_input.value(),
+                      'aging_cap': self.aging_cap_input.value(),
+                      'preemptive': self.preemptive_check.isChecked()}
+        cores = self.cores_input.value()
+        if cores > 1:
+            params = {'cores': cores, **QUEUE_LAYOUTS[self.queues_box.currentText()]}
+        self.run_params = {'quantum': quantum, **params} if algo == "Round Robin" else params
+
+        # Multi-core runs are always simulated from scratch.
+        incremental = None
+        if cores == 1:
+            if self.incremental is None or (self.incremental.quantum, self.incremental.params) != (quantum, params):
+                self.incremental = IncrementalScheduler(ALGORITHM_FUNCTIONS[algo], quantum, **params)
+            incremental = self.incremental
+        profile = RunProfile() if self.profile_check.isChecked() else None
+        self.worker = SchedulerWorker(ALGORITHM_FUNCTIONS[algo], table, quantum, self.cache,
+                                      incremental, params, profile, self)
+        self.progress_dialog = QProgressDialog(f"Running {algo}...", "Cancel", 0, 1000, self)
+        self.progress_dialog.setWindowModality(Qt.WindowModal)
+        self.progress_dialog.setMinimumDuration(500)
+        self.progress_dialog.setAutoReset(False)
+        self.progress_dialog.canceled.connect(self.worker.cancel)
+        self.worker.progressed.connect(self.progress_dialog.setValue)
+        self.worker.completed.connect(self.on_scheduler_completed)
+        self.worker.failed.connect(self.on_scheduler_failed)
+        self.worker.finished.connect(self.on_scheduler_finished)
+        self.run_btn.setDisabled(True)
+        self.worker.start()
+
+    def on_scheduler_completed(self, table, gantt, profile):
+        self.on_run(table, gantt, self.selected_algo, profile, self.run_params)
+
+    def on_scheduler_failed(self, message):
+        QMessageBox.warning(self, "Error", f"Scheduling failed: {message}")
+
+    def on_scheduler_finished(self):
+        self.progress_dialog.close()
+        self.run_btn.setDisabled(False)
+        self.worker.deleteLater()
+        self.worker = None
+
+    def stop_scheduler(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker.wait()
 
 
 
@@ -490,7 +1120,10 @@ class AlgorithmSelectionScreen(QWidget):
             "SRTF",
             "Priority Non-Preemptive",
             "Priority Preemptive",
-            "Round Robin"
+            "Round Robin",
+            "CFS",
+            "MLFQ",
+            "Priority Aging"
         ]
         self.current_index = 0
         self.initUI()
@@ -557,14 +1190,23 @@ class MainWindow(QMainWindow):
         self.proc_input_screen = None
         self.result_screen = None
 
+        file_menu = self.menuBar().addMenu("File")
+        open_action = file_menu.addAction("Open Trace...")
+        open_action.setShortcut("Ctrl+O")
+        open_action.triggered.connect(self.open_trace)
+        # Re-running an unchanged workload, e.g. after going back from the
+        # results, is answered from here instead of simulating again.
+        self.result_cache = ResultCache()
+
     def on_algo_selected(self,algo):
-        self.proc_input_screen = ProcessInputScreen(self.back_to_algo,self.show_results,algo)
+        self.proc_input_screen = ProcessInputScreen(self.back_to_algo,self.show_results,algo,self.result_cache)
         self.stack.addWidget(self.proc_input_screen)
         self.stack.setCurrentWidget(self.proc_input_screen)
 
     def back_to_algo(self):
         self.stack.setCurrentWidget(self.alg_screen)
         if self.proc_input_screen:
+            self.proc_input_screen.stop_scheduler()
             self.stack.removeWidget(self.proc_input_screen)
             self.proc_input_screen.deleteLater()
             self.proc_input_screen = None
@@ -573,13 +1215,33 @@ class MainWindow(QMainWindow):
             self.result_screen.deleteLater()
             self.result_screen = None
 
-    def show_results(self,processes,gantt_data,algorithm):
-        self.result_screen = ResultScreen(processes,gantt_data,algorithm,self.back_to_proc_input)
+    def show_results(self,processes,gantt_data,algorithm,profile=None,params=None):
+        self.result_screen = ResultScreen(processes,gantt_data,algorithm,self.back_to_proc_input,profile,params)
+        self.stack.addWidget(self.result_screen)
+        self.stack.setCurrentWidget(self.result_screen)
+
+    def open_trace(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Open Trace", "", TRACE_FILTER)
+        if path:
+            self.show_trace(path)
+
+    def show_trace(self, path):
+        back_text = "Back to Process Input" if self.proc_input_screen else "Back to Algorithm Selection"
+        try:
+            screen = ResultScreen.from_trace(path, self.back_to_proc_input, back_text)
+        except (OSError, ValueError, KeyError) as e:
+            QMessageBox.warning(self, "Error", f"Could not open trace: {e}")
+            return
+        if self.result_screen:
+            self.stack.removeWidget(self.result_screen)
+            self.result_screen.deleteLater()
+        self.result_screen = screen
         self.stack.addWidget(self.result_screen)
         self.stack.setCurrentWidget(self.result_screen)
 
     def back_to_proc_input(self):
-        self.stack.setCurrentWidget(self.proc_input_screen)
+        # Results opened from a trace may have no input screen behind them.
+        self.stack.setCurrentWidget(self.proc_input_screen or self.alg_screen)
         if self.result_screen:
             self.stack.removeWidget(self.result_screen)
             self.result_screen.deleteLater()
@@ -0,0 +1,261 @@
+import csv
+import json
+from itertools import compress, islice
+from operator import attrgetter
+
+import numpy as np
+
+from scheduler_core import LATENCY_METRICS, PERCENTILES, ProcessTable
+
+FORMATS = ('csv', 'jsonl')
+
+def detect_format(path, default='csv'):
+    if path.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    if path.endswith('.csv'):
+        return 'csv'
+    return default
+
+def read_tables(stream, fmt='csv', chunk_size=100000):
+    # Yields the workload as ProcessTables of at most chunk_size rows, so a
+    # file never has to be held in memory as a whole. Rows get the checks of
+    # import_processes(), except for PID reuse, and the first that fails
+    # raises ValueError with its line number. Priority is optional, but once
+    # a workload gives it every row needs one.
+    has_priority = None
+    for lines, raw, errors in _numbered_chunks(stream, fmt, ProcessTable.INPUT_COLUMNS, chunk_size, ('Priority',)):
+        given = _given(raw['Priority'])
+        if has_priority is None:
+            has_priority = bool(given.any())
+        elif not has_priority and given.any():
+            raise ValueError(f"line {int(lines[given][0])}: Priority is given here but not on earlier lines")
+        names = ProcessTable.INPUT_COLUMNS[:3 + has_priority]
+        values, _, check_errors = _check_columns(lines, raw, names)
+        errors = sorted(errors + check_errors, key=lambda error: error[0])
+        if errors:
+            raise ValueError(f"line {errors[0][0]}: {errors[0][1]}")
+        yield ProcessTable(*(values[name] for name in names))
+
+# Checking a workload before it is imported. Each chunk of records is
+# converted column by column and checked with array operations, so only the
+# rows that fail pay for a Python-level look. Problems are reported as
+# (line number, message) pairs, one per failed check, and the rows that
+# have any are left out.
+def _numbered_chunks(stream, fmt, names, chunk_size, optional=()):
+    # Yields (lines, columns, errors) per chunk of records: the line number
+    # each record starts on, the raw values of each named field (None where
+    # a record has none), and the records that could not be read at all.
+    # A CSV header may leave out the optional names.
+    if fmt == 'csv':
+        reader = csv.reader(stream)
+        header = [name.strip() for name in next(reader, [])]
+        missing = [name for name in names if name not in header and name not in optional]
+        if missing:
+            raise ValueError(f"The header is missing {', '.join(missing)}")
+        index = [header.index(name) if name in header else None for name in names]
+        while True:
+            before = reader.line_num
+            rows = list(islice(reader, chunk_size))
+            if not rows:
+                return
+            spans = np.ones(len(rows), np.int64)
+            if reader.line_num - before != len(rows):
+                # Some quoted field runs over several lines.
+                spans += [sum(field.count('\n') for field in row) for row in rows]
+            lines = before + np.cumsum(spans) - spans + 1
+            widths = np.fromiter(map(len, rows), np.int64, len(rows))
+            # Blank lines are skipped, as csv.DictReader does.
+            wrong = (widths != len(header)) & (widths > 0)
+            errors = [(line, f"{width} fields, expected {len(header)}")
+                      for line, width in zip(lines[wrong].tolist(), widths[wrong].tolist())]
+            keep = widths == len(header)
+            if not keep.all():
+                rows = list(compress(rows, keep.tolist()))
+                lines = lines[keep]
+            fields = list(zip(*rows)) or [()] * len(header)
+            yield lines, {name: fields[i] if i is not None else (None,) * len(rows)
+                          for name, i in zip(names, index)}, errors
+    else:
+        numbered = ((number, line) for number, line in enumerate(stream, 1) if line.strip())
+        while True:
+            chunk = list(islice(numbered, chunk_size))
+            if not chunk:
+                return
+            try:
+                # One parse of the whole chunk is much faster than one per
+                # line, and gives one object per line unless some line is bad.
+                records = json.loads(f"[{','.join(line for _, line in chunk)}]")
+            except ValueError:
+                records = None
+            if (records is None or len(records) != len(chunk)
+                    or not all(isinstance(record, dict) for record in records)):
+                records, errors = _json_records(chunk)
+            else:
+                records, errors = list(zip((number for number, _ in chunk), records)), []
+            yield (np.array([number for number, _ in records], np.int64),
+                   {name: [record.get(name) for _, record in records] for name in names}, errors)
+
+def _json_records(chunk):
+    # (line number, record) for each line of the chunk that holds a JSON
+    # object, and (line number, message) for each that does not.
+    records, errors = [], []
+    for number, line in chunk:
+        try:
+            record = json.loads(line)
+        except ValueError:
+            errors.append((number, "not valid JSON"))
+            continue
+        if isinstance(record, dict):
+            records.append((number, record))
+        else:
+            errors.append((number, "not a JSON object"))
+    return records, errors
+
+def _int_or_none(value):
+    # Only real ints and strings holding one count as integers; JSON floats
+    # and booleans would otherwise be cut or read as 0 and 1.
+    if type(value) not in (int, str):
+        return None
+    try:
+        value = int(value)
+    except ValueError:
+        return None
+    return value if -2**63 <= value < 2**63 else None
+
+def _int_column(values):
+    # The values as an int64 array, and which of them are not integers (0
+    # in the array), or None when all of them are.
+    if set(map(type, values)) <= {int, str}:
+        try:
+            return np.fromiter(map(int, values), np.int64, len(values)), None
+        except (ValueError, OverflowError):
+            pass
+    parsed = [_int_or_none(value) for value in values]
+    bad = np.fromiter((value is None for value in parsed), bool, len(parsed))
+    return np.array([0 if value is None else value for value in parsed], np.int64), bad
+
+def _given(values):
+    # Which of the raw values are there at all, as a bool array.
+    return np.fromiter((value is not None and not (isinstance(value, str) and not value.strip())
+                        for value in values), bool, len(values))
+
+def _check_columns(lines, raw, names):
+    # Converts one chunk's raw fields to int64 columns and checks them.
+    # Returns the columns, which rows passed, and the (line number, message)
+    # problems of the rest: a field that is missing or not an integer, AT
+    # below 0 and BT not above 0.
+    ok = np.ones(len(lines), bool)
+    values, unread, errors = {}, {}, []
+    for name in names:
+        values[name], unread[name] = _int_column(raw[name])
+        if unread[name] is not None:
+            for i in np.flatnonzero(unread[name]).tolist():
+                value = raw[name][i]
+                missing = value is None or (isinstance(value, str) and not value.strip())
+                errors.append((int(lines[i]), f"no {name}" if missing else f"{name} {value!r} is not an integer"))
+            ok &= ~unread[name]
+    for name, failed, rule in (('AT', values['AT'] < 0, ">= 0"), ('BT', values['BT'] <= 0, "> 0")):
+        if unread[name] is not None:
+            failed &= ~unread[name]
+        errors += [(line, f"{name} {value} must be {rule}")
+                   for line, value in zip(lines[failed].tolist(), values[name][failed].tolist())]
+        ok &= ~failed
+    return values, ok, errors
+
+def check_records(records):
+    # Checks a list of process dicts, such as a JSON request body, by the
+    # rules of read_tables(). Returns a ProcessTable, which only holds the
+    # workload if there are no problems, and the (index, message) problems
+    # by position in the list.
+    errors = [(i, "not a JSON object") for i, record in enumerate(records) if not isinstance(record, dict)]
+    records = [record if isinstance(record, dict) else {} for record in records]
+    raw = {name: [record.get(name) for record in records] for name in ProcessTable.INPUT_COLUMNS}
+    names = ProcessTable.INPUT_COLUMNS[:3 + bool(_given(raw['Priority']).any())]
+    values, _, check_errors = _check_columns(np.arange(len(records)), raw, names)
+    errors = sorted(errors + check_errors, key=lambda error: error[0])
+    return ProcessTable(*(values[name] for name in names)), errors
+
+def import_processes(stream, fmt='csv', priority=False, taken=(), chunk_size=100000):
+    # Reads a workload for import into an existing list of processes, which
+    # already uses the PIDs in `taken`. Returns a ProcessTable of the rows
+    # that pass every check, in file order, and the (line number, message)
+    # problems of the rest sorted by line: a field that is missing or not an
+    # integer, AT below 0, BT not above 0, and a PID that is taken or
+    # repeats an earlier row. Priority is read, and required, only when
+    # `priority` is set. A CSV header without one of the needed columns
+    # raises ValueError.
+    names = ProcessTable.INPUT_COLUMNS[:3 + bool(priority)]
+    lines, columns, valid, errors = [], {name: [] for name in names}, [], []
+    for chunk_lines, raw, chunk_errors in _numbered_chunks(stream, fmt, names, chunk_size):
+        values, ok, check_errors = _check_columns(chunk_lines, raw, names)
+        errors += chunk_errors + check_errors
+        for name in names:
+            columns[name].append(values[name])
+        lines.append(chunk_lines)
+        valid.append(ok)
+    lines = np.concatenate(lines) if lines else np.zeros(0, np.int64)
+    columns = {name: np.concatenate(arrays) if arrays else np.zeros(0, np.int64) for name, arrays in columns.items()}
+    ok = np.concatenate(valid) if valid else np.zeros(0, bool)
+
+    pid = columns['PID']
+    failed = ok & np.isin(pid, np.asarray(list(taken), np.int64))
+    errors += [(line, f"PID {value} is already in use")
+               for line, value in zip(lines[failed].tolist(), pid[failed].tolist())]
+    ok &= ~failed
+    # Among the rows still valid, every repeat of a PID after its first.
+    rows = np.flatnonzero(ok)
+    order = rows[np.argsort(pid[rows], kind='stable')]
+    repeat = np.zeros(len(order), bool)
+    repeat[1:] = pid[order[1:]] == pid[order[:-1]]
+    first = order[np.maximum.accumulate(np.where(repeat, 0, np.arange(len(order))))]
+    errors += [(line, f"PID {value} repeats line {earlier}")
+               for line, value, earlier in zip(lines[order[repeat]].tolist(), pid[order[repeat]].tolist(),
+                                               lines[first[repeat]].tolist())]
+    ok[order[repeat]] = False
+
+    errors.sort(key=lambda error: error[0])
+    return ProcessTable(*(columns[name][ok] for name in names)), errors
+
+def _write_rows(stream, names, rows, fmt, header):
+    if fmt == 'csv':
+        writer = csv.writer(stream, lineterminator='\n')
+        if header:
+            writer.writerow(names)
+        writer.writerows(rows)
+    else:
+        stream.writelines(json.dumps(dict(zip(names, row))) + '\n' for row in rows)
+
+def write_processes(stream, table, fmt='csv', header=True):
+    # Just the input columns, in the layout read_tables() reads back.
+    names = list(table.output_columns()[:len(ProcessTable.INPUT_COLUMNS) - (not table.has_priority)])
+    _write_rows(stream, names, table.rows(names), fmt, header)
+
+def write_results(stream, table, fmt='csv', header=True):
+    names = table.output_columns()
+    _write_rows(stream, names, table.rows(names), fmt, header)
+
+def write_completions(stream, completions, fmt='csv', header=True, has_priority=True):
+    # Completion records from scheduler_core.stream_schedule(), laid out like
+    # write_results() rows.
+    names = ['PID', 'AT', 'BT'] + (['Priority'] if has_priority else []) + list(ProcessTable.RESULT_COLUMNS)
+    _write_rows(stream, names, map(attrgetter(*names), completions), fmt, header)
+
+def write_gantt(stream, gantt, fmt='csv', header=True):
+    _write_rows(stream, ('PID', 'Start', 'End'), gantt, fmt, header)
+
+def write_core_gantt(stream, lanes, fmt='csv', header=True):
+    # A multi-core gantt, one list of segments per core, core by core.
+    rows = ((core, *segment) for core, lane in enumerate(lanes) for segment in lane)
+    _write_rows(stream, ('Core', 'PID', 'Start', 'End'), rows, fmt, header)
+
+def write_core_utilization(stream, utilization, fmt='csv', header=True):
+    _write_rows(stream, ('Core', 'Utilization'), enumerate(utilization), fmt, header)
+
+SUMMARY_COLUMNS = (('Algorithm', 'Quantum')
+                   + tuple(f'{stat}{name}' for name in LATENCY_METRICS
+                           for stat in ['Avg'] + [f'P{p}' for p in PERCENTILES] + ['Max'])
+                   + ('Throughput', 'CPUUtilization', 'ContextSwitches', 'Fairness', 'Makespan'))
+
+def write_summaries(stream, summaries, fmt='csv', header=True):
+    rows = ([s.get(name) for name in SUMMARY_COLUMNS] for s in summaries)
+    _write_rows(stream, SUMMARY_COLUMNS, rows, fmt, header)
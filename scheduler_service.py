@@ -0,0 +1,415 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+from bisect import bisect_left
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import suppress
+from http import HTTPStatus
+
+from scheduler_core import ALGORITHMS, schedule, summarize
+from scheduler_io import check_records
+
+# A small HTTP/JSON front end to schedule() for local tools, built on asyncio
+# streams so it needs nothing beyond the standard library.
+#
+#   POST /schedule  one workload object, or {"workloads": [...]}. Each
+#                   workload has "algorithm", "processes" (PID, AT, BT and
+#                   optional Priority records), the algorithm's options
+#                   ("quantum", "latency", "min_granularity", "quanta",
+#                   "boost", "aging_interval", "aging_cap", "preemptive")
+#                   and "gantt": true to get the segments back.
+#                   The reply is NDJSON, one line per workload in the order
+#                   they finish, each tagged with the workload's "index".
+#   GET /health     status, queue depth, completed/failed/rejected counts,
+#                   a latency histogram and recent throughput.
+#
+# Workloads wait in a bounded queue and run in a process pool. A pool the
+# service owns is replaced when a worker dies; a broken pool passed in as
+# `executor` leaves the status "degraded". A request
+# that does not fit in the queue is turned away with 503 and Retry-After
+# rather than held, so a burst of clients cannot pile up memory. Small
+# workloads that are waiting together go to a worker in one batch, which
+# saves a pool round trip each.
+DEFAULT_PORT = 8765
+ALGORITHM_PARAMS = {'round_robin': ('quantum',), 'cfs': ('latency', 'min_granularity'),
+                    'mlfq': ('quanta', 'boost'),
+                    'priority_aging': ('aging_interval', 'aging_cap', 'preemptive')}
+# Upper bounds, in seconds, of the latency histogram buckets; one more
+# bucket counts everything slower.
+LATENCY_BUCKETS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5, 1, 2, 5, 10, 30, 60)
+THROUGHPUT_WINDOW = 60
+
+Job = namedtuple('Job', 'args rows results enqueued')
+
+class RequestError(Exception):
+    def __init__(self, status, message, headers=()):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers
+
+class ServiceError(Exception):
+    # Raised by ServiceClient for any reply other than 200.
+    def __init__(self, status, message):
+        super().__init__(f"{status}: {message}")
+        self.status = status
+
+def _line(record):
+    return (json.dumps(record) + '\n').encode()
+
+def _run_job(index, algorithm, table, quantum, params, with_gantt):
+    try:
+        table, gantt = schedule(algorithm, table, quantum=quantum, **params)
+    except (TypeError, ValueError) as e:
+        return False, _line({'index': index, 'algorithm': algorithm, 'error': str(e)})
+    names = table.output_columns()
+    record = {'index': index, 'algorithm': algorithm, 'summary': summarize(table, gantt),
+              'results': [dict(zip(names, row)) for row in table.rows(names)]}
+    if with_gantt:
+        record['gantt'] = gantt
+    return True, _line(record)
+
+def _run_batch(jobs):
+    # Runs in a pool worker. Lines are encoded there too, so the event loop
+    # only copies bytes.
+    return [_run_job(*args) for args in jobs]
+
+def parse_workload(index, spec):
+    # Checks a workload in the request handler, before it takes a queue slot.
+    if not isinstance(spec, dict):
+        raise RequestError(400, f"workload {index}: expected a JSON object")
+    algorithm = spec.get('algorithm', 'fcfs')
+    if algorithm not in ALGORITHMS:
+        raise RequestError(400, f"workload {index}: unknown algorithm {algorithm!r}, "
+                                f"expected one of {', '.join(ALGORITHMS)}")
+    processes = spec.get('processes')
+    if not isinstance(processes, list):
+        raise RequestError(400, f"workload {index}: 'processes' must be a list of records")
+    table, errors = check_records(processes)
+    if errors:
+        # The same rules as the GUI and file import.
+        position, message = errors[0]
+        raise RequestError(400, f"workload {index}: process {position}: {message}")
+    params = {name: spec[name] for name in ALGORITHM_PARAMS.get(algorithm, ()) if name in spec}
+    for name, value in params.items():
+        if name == 'preemptive':
+            continue
+        if name == 'quanta':
+            if not isinstance(value, list) or not all(isinstance(q, int) and not isinstance(q, bool) for q in value):
+                raise RequestError(400, f"workload {index}: 'quanta' must be a list of integers")
+            params[name] = tuple(value)
+        elif not isinstance(value, int) or isinstance(value, bool):
+            raise RequestError(400, f"workload {index}: {name!r} must be an integer")
+    quantum = params.pop('quantum', 2)
+    return (index, algorithm, table, quantum, params, bool(spec.get('gantt'))), len(table)
+
+class ServiceStats:
+    def __init__(self):
+        self.started = time.monotonic()
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+        self._recent = deque()
+
+    def record(self, latency, ok):
+        # latency runs from enqueueing to the result being ready.
+        if ok:
+            self.completed += 1
+        else:
+            self.failed += 1
+        self.histogram[bisect_left(LATENCY_BUCKETS, latency)] += 1
+        self._recent.append(time.monotonic())
+
+    def throughput(self):
+        # Workloads finished per second over the last THROUGHPUT_WINDOW seconds.
+        now = time.monotonic()
+        while self._recent and self._recent[0] < now - THROUGHPUT_WINDOW:
+            self._recent.popleft()
+        span = min(THROUGHPUT_WINDOW, now - self.started)
+        return len(self._recent) / span if span > 0 else 0.0
+
+def _head(status, content_type, headers=()):
+    status = HTTPStatus(status)
+    lines = [f"HTTP/1.1 {status.value} {status.phrase}", f"Content-Type: {content_type}",
+             "Connection: close", *headers]
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+async def _read_head(reader):
+    # The start line and the headers, lower-cased, of a request or response.
+    start = (await reader.readline()).decode('latin-1').strip()
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            return start, headers
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+class SchedulerService:
+    # Use as `async with SchedulerService(port=0) as service:`, which binds a
+    # free port (service.port) for the duration, then serve_forever() to run
+    # until cancelled.
+    # executor may be any concurrent.futures executor; by default the
+    # service owns a ProcessPoolExecutor of max_workers processes.
+    def __init__(self, host='127.0.0.1', port=DEFAULT_PORT, max_workers=None, max_queue=64, batch_size=16,
+                 batch_rows=10000, max_body=64 * 2**20, executor=None):
+        self.host = host
+        self.port = port
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.batch_rows = batch_rows
+        self.max_body = max_body
+        self.stats = ServiceStats()
+        self.in_flight = 0
+        self._executor = executor
+        self._owns_executor = executor is None
+        # Set when the pool has broken and could not be replaced.
+        self._broken = False
+        self.pool_restarts = 0
+        self._queue = None
+        self._dispatchers = []
+        self._server = None
+
+    async def start(self):
+        if self._owns_executor:
+            self._executor = ProcessPoolExecutor(self.max_workers)
+        self._queue = asyncio.Queue(self.max_queue)
+        # One dispatcher per worker keeps at most one batch per worker in the
+        # pool; everything else waits in the bounded queue.
+        self._dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(self.max_workers)]
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        for task in self._dispatchers:
+            task.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        self._dispatchers = []
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def serve_forever(self):
+        # After start(); returns only when cancelled.
+        await self._server.serve_forever()
+
+    def health(self):
+        return {
+            'status': 'degraded' if self._broken else 'ok',
+            'uptime': time.monotonic() - self.stats.started,
+            'workers': self.max_workers,
+            'queue_depth': self._queue.qsize(),
+            'max_queue': self.max_queue,
+            'in_flight': self.in_flight,
+            'pool_restarts': self.pool_restarts,
+            'completed': self.stats.completed,
+            'failed': self.stats.failed,
+            'rejected': self.stats.rejected,
+            'throughput': self.stats.throughput(),
+            'latency_histogram': {'le': list(LATENCY_BUCKETS) + ['+Inf'], 'counts': list(self.stats.histogram)},
+        }
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            rows = batch[0].rows
+            while len(batch) < self.batch_size and rows < self.batch_rows and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                rows += batch[-1].rows
+            self.in_flight += len(batch)
+            executor = self._executor
+            try:
+                lines = await loop.run_in_executor(executor, _run_batch, [job.args for job in batch])
+            except asyncio.CancelledError:
+                raise
+            except BrokenProcessPool as e:
+                # A worker process died, which leaves the whole pool unusable.
+                self._replace_executor(executor)
+                lines = [(False, _line({'index': job.args[0], 'error': f"worker failed: {e!r}"}))
+                         for job in batch]
+            except Exception as e:
+                # The batch fails, the service goes on.
+                lines = [(False, _line({'index': job.args[0], 'error': f"worker failed: {e!r}"}))
+                         for job in batch]
+            finally:
+                self.in_flight -= len(batch)
+            now = time.monotonic()
+            for job, (ok, line) in zip(batch, lines):
+                self.stats.record(now - job.enqueued, ok)
+                job.results.put_nowait(line)
+
+    def _replace_executor(self, broken):
+        # Dispatchers that shared the broken pool all end up here; only the
+        # first replaces it. An executor passed in by the caller is theirs
+        # to replace, so until then the service reports itself degraded.
+        if self._executor is not broken:
+            return
+        if not self._owns_executor:
+            self._broken = True
+            return
+        broken.shutdown(wait=False, cancel_futures=True)
+        self._executor = ProcessPoolExecutor(self.max_workers)
+        self.pool_restarts += 1
+
+    async def _handle(self, reader, writer):
+        try:
+            try:
+                method, path, body = await self._read_request(reader)
+                if path == '/health':
+                    if method != 'GET':
+                        raise RequestError(405, "use GET /health", ["Allow: GET"])
+                    await self._respond_json(writer, 200, self.health())
+                elif path == '/schedule':
+                    if method != 'POST':
+                        raise RequestError(405, "use POST /schedule", ["Allow: POST"])
+                    await self._schedule(writer, body)
+                else:
+                    raise RequestError(404, f"no such endpoint {path}")
+            except RequestError as e:
+                await self._respond_json(writer, e.status, {'error': str(e)}, e.headers)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            with suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _read_request(self, reader):
+        start, headers = await _read_head(reader)
+        parts = start.split()
+        if len(parts) != 3:
+            raise RequestError(400, "malformed request line")
+        try:
+            length = int(headers.get('content-length') or 0)
+        except ValueError:
+            raise RequestError(400, "bad Content-Length")
+        if length > self.max_body:
+            raise RequestError(413, f"request body over {self.max_body} bytes")
+        body = await reader.readexactly(length) if length > 0 else b''
+        return parts[0], parts[1].split('?', 1)[0], body
+
+    async def _respond_json(self, writer, status, record, headers=()):
+        body = json.dumps(record).encode()
+        writer.write(_head(status, 'application/json', [f"Content-Length: {len(body)}", *headers]) + body)
+        await writer.drain()
+
+    async def _schedule(self, writer, body):
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            raise RequestError(400, "request body is not valid JSON")
+        specs = payload['workloads'] if isinstance(payload, dict) and 'workloads' in payload else [payload]
+        if not isinstance(specs, list) or not specs:
+            raise RequestError(400, "'workloads' must be a non-empty list")
+        if len(specs) > self.max_queue:
+            raise RequestError(413, f"at most {self.max_queue} workloads per request")
+        jobs = [parse_workload(i, spec) for i, spec in enumerate(specs)]
+        if self._queue.qsize() + len(jobs) > self.max_queue:
+            self.stats.rejected += 1
+            raise RequestError(503, "queue full, retry later", ["Retry-After: 1"])
+        results = asyncio.Queue()
+        enqueued = time.monotonic()
+        for args, rows in jobs:
+            self._queue.put_nowait(Job(args, rows, results, enqueued))
+        writer.write(_head(200, 'application/x-ndjson', ["Transfer-Encoding: chunked"]))
+        for _ in jobs:
+            line = await results.get()
+            writer.write(b'%x\r\n%s\r\n' % (len(line), line))
+            await writer.drain()
+        writer.write(b'0\r\n\r\n')
+        await writer.drain()
+
+class ServiceClient:
+    # Minimal asyncio client, e.g. for talking to a SchedulerService started
+    # in the same process.
+    def __init__(self, host='127.0.0.1', port=DEFAULT_PORT):
+        self.host = host
+        self.port = port
+
+    async def _request(self, method, path, payload=None):
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        body = b'' if payload is None else json.dumps(payload).encode()
+        writer.write((f"{method} {path} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\n"
+                      f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n").encode('latin-1')
+                     + body)
+        await writer.drain()
+        start, headers = await _read_head(reader)
+        status = int(start.split()[1])
+        if status != 200:
+            body = await reader.read()
+            writer.close()
+            try:
+                message = json.loads(body)['error']
+            except (ValueError, KeyError, TypeError):
+                message = body.decode(errors='replace')
+            raise ServiceError(status, message)
+        return reader, writer, headers
+
+    async def health(self):
+        reader, writer, _ = await self._request('GET', '/health')
+        try:
+            return json.loads(await reader.read())
+        finally:
+            writer.close()
+
+    async def schedule(self, workloads):
+        # Yields one result record per workload as the service streams them.
+        # workloads is a single workload dict or a list of them.
+        payload = {'workloads': workloads} if isinstance(workloads, list) else workloads
+        reader, writer, headers = await self._request('POST', '/schedule', payload)
+        try:
+            buffer = b''
+            while True:
+                size = int((await reader.readline()).strip() or b'0', 16)
+                if not size:
+                    break
+                buffer += await reader.readexactly(size)
+                await reader.readexactly(2)
+                *lines, buffer = buffer.split(b'\n')
+                for line in lines:
+                    yield json.loads(line)
+        finally:
+            writer.close()
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Serve the scheduling algorithms over HTTP/JSON on localhost.")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('-j', '--workers', type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument('--max-queue', type=int, default=64,
+                        help="workloads that may wait at once; requests beyond that get 503")
+    parser.add_argument('--batch-size', type=int, default=16,
+                        help="most queued workloads handed to a worker together")
+    return parser
+
+async def _serve(args):
+    service = SchedulerService(args.host, args.port, args.workers, args.max_queue, args.batch_size)
+    async with service:
+        print(f"Serving on http://{service.host}:{service.port}", flush=True)
+        await service.serve_forever()
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.max_queue < 1 or args.batch_size < 1:
+        raise SystemExit("error: --max-queue and --batch-size must be at least 1")
+    with suppress(KeyboardInterrupt):
+        asyncio.run(_serve(args))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+import json
+import os
+import shutil
+import struct
+import tempfile
+from contextlib import suppress
+from itertools import count
+from operator import attrgetter
+
+import numpy as np
+
+from scheduler_core import ALGORITHMS, ProcessTable, schedule_segments
+
+# Trace file layout, all little-endian:
+#   header    magic, version, metadata length, segment count, result count
+#   metadata  JSON with the algorithm, its parameters and has_priority,
+#             space-padded to a multiple of 8 bytes
+#   segments  one (pid, start, end) int64 record each
+#   results   one (PID, AT, BT, Priority, ST, CT) int64 record each
+MAGIC = b'SCHDTRC\0'
+VERSION = 1
+_HEADER = struct.Struct('<8sIIQQ')
+SEGMENT_FIELDS = ('PID', 'Start', 'End')
+RESULT_FIELDS = ('PID', 'AT', 'BT', 'Priority', 'ST', 'CT')
+_completion_fields = attrgetter(*RESULT_FIELDS)
+
+def _trace_params(algorithm, quantum, params):
+    return {'quantum': quantum} if algorithm == 'round_robin' else dict(params)
+
+class TraceWriter:
+    # Segments and results are buffered and written in blocks of block_size
+    # records. Results go to a temporary file beside the trace until close(),
+    # which appends them after the segments and fills in the header counts.
+    # has_priority may be set any time before then.
+    #
+    # The trace itself is also written beside `path` under a temporary name
+    # and only moved over it by close(). A trace already at `path`, which a
+    # TraceReader may have memory-mapped, is never truncated, and stays as
+    # it was if the write fails.
+    def __init__(self, path, algorithm, params=None, has_priority=False, block_size=65536):
+        self.path = path
+        self.algorithm = algorithm
+        self.params = params or {}
+        self.has_priority = has_priority
+        self.block_size = block_size
+        self.n_segments = 0
+        self.n_results = 0
+        self._segments = []
+        self._results = []
+        # Reserve room for the longer of the two metadata variants so the
+        # final one can be written in place.
+        self._meta_size = -(-len(self._metadata(False)) // 8) * 8
+        self._temp_path, self._file = self._open_temp(path)
+        self._results_file = tempfile.TemporaryFile(dir=os.path.dirname(os.path.abspath(path)))
+        self._write_header()
+
+    @staticmethod
+    def _open_temp(path):
+        # Opened with 'xb' rather than through tempfile so the trace gets the
+        # usual umask permissions.
+        for attempt in count():
+            temp_path = f"{path}.{os.getpid()}.{attempt}.tmp"
+            try:
+                return temp_path, open(temp_path, 'xb')
+            except FileExistsError:
+                continue
+
+    def _metadata(self, has_priority):
+        return json.dumps({'algorithm': self.algorithm, 'params': self.params,
+                           'has_priority': has_priority}).encode()
+
+    def _write_header(self):
+        meta = self._metadata(self.has_priority)
+        self._file.write(_HEADER.pack(MAGIC, VERSION, self._meta_size, self.n_segments, self.n_results))
+        self._file.write(meta.ljust(self._meta_size))
+
+    def _flush_segments(self):
+        if self._segments:
+            self._file.write(np.array(self._segments, dtype='<i8').tobytes())
+            self._segments.clear()
+
+    def _flush_results(self):
+        if self._results:
+            self._results_file.write(np.array(self._results, dtype='<i8').tobytes())
+            self._results.clear()
+
+    def add_segment(self, segment):
+        self._segments.append(segment)
+        self.n_segments += 1
+        if len(self._segments) >= self.block_size:
+            self._flush_segments()
+
+    def add_segments(self, segments):
+        before = len(self._segments)
+        self._segments.extend(segments)
+        self.n_segments += len(self._segments) - before
+        if len(self._segments) >= self.block_size:
+            self._flush_segments()
+
+    def add_completion(self, completion):
+        self._results.append(_completion_fields(completion))
+        self.n_results += 1
+        if len(self._results) >= self.block_size:
+            self._flush_results()
+
+    def add_results(self, table):
+        self._flush_results()
+        self._results_file.write(np.column_stack([table[name] for name in RESULT_FIELDS])
+                                 .astype('<i8', copy=False).tobytes())
+        self.n_results += len(table)
+
+    def close(self):
+        if self._file.closed:
+            return
+        try:
+            self._flush_segments()
+            self._flush_results()
+            self._results_file.seek(0)
+            shutil.copyfileobj(self._results_file, self._file, 2**20)
+            self._results_file.close()
+            self._file.seek(0)
+            self._write_header()
+            self._file.close()
+            os.replace(self._temp_path, self.path)
+        except BaseException:
+            self._discard()
+            raise
+
+    def _discard(self):
+        self._file.close()
+        self._results_file.close()
+        with suppress(FileNotFoundError):
+            os.remove(self._temp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            # Never leave a trace behind whose header does not match its body.
+            self._discard()
+
+class TraceReader:
+    # Memory-maps a trace. gantt is an (n, 3) int64 view of the segments and
+    # results an (n, 6) one of the result records, so gantt[:, 1] etc. are
+    # column views that never copy the file into memory.
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            magic, version, meta_size, n_segments, n_results = _HEADER.unpack(f.read(_HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a scheduler trace")
+            if version != VERSION:
+                raise ValueError(f"{path} is trace version {version}, expected {VERSION}")
+            meta = json.loads(f.read(meta_size))
+        self.algorithm = meta['algorithm']
+        self.params = meta['params']
+        self.has_priority = meta['has_priority']
+        offset = _HEADER.size + meta_size
+        self.gantt = self._map(offset, n_segments, len(SEGMENT_FIELDS))
+        self.results = self._map(offset + n_segments * len(SEGMENT_FIELDS) * 8, n_results, len(RESULT_FIELDS))
+
+    def _map(self, offset, rows, width):
+        if not rows:
+            return np.zeros((0, width), dtype='<i8')
+        return np.memmap(self.path, dtype='<i8', mode='r', offset=offset, shape=(rows, width))
+
+    def table(self):
+        # The results as a ProcessTable with TAT, WT and RT filled in.
+        columns = dict(zip(RESULT_FIELDS, self.results.T))
+        table = ProcessTable(columns['PID'], columns['AT'], columns['BT'],
+                             columns['Priority'] if self.has_priority else None)
+        table['ST'] = columns['ST']
+        table['CT'] = columns['CT']
+        table.compute_metrics()
+        return table
+
+def write_trace(path, table, gantt, algorithm, quantum=2, block_size=65536, **params):
+    # Saves results that are already in memory.
+    with TraceWriter(path, algorithm, _trace_params(algorithm, quantum, params), table.has_priority,
+                     block_size) as writer:
+        writer.add_segments(gantt)
+        writer.add_results(table)
+
+def schedule_to_trace(path, algorithm, processes, quantum=2, progress=None, profile=None, block_size=65536,
+                      **params):
+    # Like schedule(), but the gantt goes straight to a trace file as it is
+    # produced and is never held in memory. Fills in the result columns of
+    # the table, which is returned and also saved in the trace.
+    if algorithm not in ALGORITHMS:
+        raise ValueError(f"Unknown algorithm {algorithm!r}, expected one of {', '.join(ALGORITHMS)}")
+    if profile is not None:
+        profile.start()
+    table = processes if isinstance(processes, ProcessTable) else ProcessTable.from_dicts(processes)
+    with TraceWriter(path, algorithm, _trace_params(algorithm, quantum, params), table.has_priority,
+                     block_size) as writer:
+        schedule_segments(algorithm, table, writer.add_segment, quantum, progress, profile, **params)
+        table.compute_metrics()
+        if profile is not None:
+            profile.lap('metrics')
+        writer.add_results(table)
+    if profile is not None:
+        # Writing out the results and the header.
+        profile.lap('merge')
+    return table
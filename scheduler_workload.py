@@ -0,0 +1,132 @@
+import argparse
+import sys
+from contextlib import ExitStack
+from itertools import chain
+
+import numpy as np
+
+from scheduler_core import ProcessTable
+from scheduler_io import FORMATS, detect_format, write_processes
+
+# Synthetic workloads, produced lazily in arrival order one block at a time,
+# so any number of processes takes the same memory.
+#
+#   arrivals     'poisson': exponential gaps. 'bursty': bursts arrive as a
+#                Poisson process and every process in a burst arrives at the
+#                same time; burst sizes are geometric with mean burst_size.
+#   bursts       'exponential': 1 + floor(Exp(burst_scale)). 'pareto':
+#                heavy-tailed with mean burst_scale and tail index
+#                pareto_shape (which must be above 1 for the mean to exist).
+#   priorities   Zipf over 1..max_priority with exponent zipf_a, so most
+#                processes share the top priority and a few get the others.
+#
+# Gaps are spaced so the offered load, mean burst over mean gap, is about
+# `load`. Bursts, gaps, burst boundaries and priorities each draw from their
+# own stream of one seed, so the output depends only on the seed and the
+# parameters, never on chunk_size.
+ARRIVALS = ('poisson', 'bursty')
+BURSTS = ('exponential', 'pareto')
+BLOCK_SIZE = 65536
+MAX_BURST = 10**9
+
+def _check(arrivals, bursts, burst_scale, load, pareto_shape, burst_size, max_priority):
+    if arrivals not in ARRIVALS:
+        raise ValueError(f"Unknown arrival process {arrivals!r}, expected one of {', '.join(ARRIVALS)}")
+    if bursts not in BURSTS:
+        raise ValueError(f"Unknown burst distribution {bursts!r}, expected one of {', '.join(BURSTS)}")
+    if burst_scale <= 0 or load <= 0:
+        raise ValueError("The burst scale and load must be positive")
+    if bursts == 'pareto' and pareto_shape <= 1:
+        raise ValueError("The Pareto shape must be above 1")
+    if arrivals == 'bursty' and burst_size < 1:
+        raise ValueError("The mean burst size must be at least 1")
+    if max_priority < 1:
+        raise ValueError("max_priority must be at least 1")
+
+def generate_tables(n, arrivals='poisson', bursts='exponential', burst_scale=10, load=0.9, pareto_shape=1.5,
+                    burst_size=8, zipf_a=1.2, max_priority=10, seed=0, first_pid=1, start=0,
+                    chunk_size=BLOCK_SIZE):
+    # The workload as an iterator of ProcessTables of up to chunk_size rows,
+    # PIDs numbered from first_pid and the first arrival at `start`. Bad
+    # parameters raise ValueError here rather than on the first chunk.
+    _check(arrivals, bursts, burst_scale, load, pareto_shape, burst_size, max_priority)
+    return _tables(n, arrivals, bursts, burst_scale, load, pareto_shape, burst_size, zipf_a, max_priority, seed,
+                   first_pid, start, chunk_size)
+
+def _tables(n, arrivals, bursts, burst_scale, load, pareto_shape, burst_size, zipf_a, max_priority, seed,
+            first_pid, start, chunk_size):
+    burst_rng, gap_rng, boundary_rng, priority_rng = (np.random.default_rng(s)
+                                                      for s in np.random.SeedSequence(seed).spawn(4))
+    # Both burst forms round up, which adds about half a unit to the mean.
+    mean_gap = (burst_scale + 0.5) / load
+    ranks = np.arange(1, max_priority + 1)
+    priority_weights = ranks ** -float(zipf_a)
+    priority_weights /= priority_weights.sum()
+    # Continuous Pareto with minimum x_m has mean x_m * shape / (shape - 1).
+    pareto_min = burst_scale * (pareto_shape - 1) / pareto_shape
+    clock = float(start)
+    for first in range(0, n, chunk_size):
+        size = min(chunk_size, n - first)
+        if bursts == 'exponential':
+            bt = 1 + burst_rng.exponential(burst_scale, size).astype(np.int64)
+        else:
+            bt = np.ceil(pareto_min * (1 + burst_rng.pareto(pareto_shape, size)))
+            bt = np.minimum(bt, MAX_BURST).astype(np.int64)
+        if arrivals == 'poisson':
+            gaps = gap_rng.exponential(mean_gap, size)
+        else:
+            # Only a burst's first process waits; bursts are burst_size
+            # times further apart to keep the same mean gap.
+            gaps = gap_rng.exponential(mean_gap * burst_size, size)
+            gaps *= boundary_rng.random(size) < 1 / burst_size
+        if first == 0:
+            gaps[0] = 0
+        times = clock + np.cumsum(gaps)
+        clock = times[-1]
+        at = np.floor(times).astype(np.int64)
+        priority = 1 + priority_rng.choice(max_priority, size, p=priority_weights)
+        yield ProcessTable(np.arange(first_pid + first, first_pid + first + size), at, bt, priority)
+
+def generate_processes(n, **options):
+    # (PID, AT, BT, Priority) tuples in arrival order, ready for
+    # scheduler_core.stream_schedule().
+    return chain.from_iterable(table.rows(ProcessTable.INPUT_COLUMNS)
+                               for table in generate_tables(n, **options))
+
+def generate_workload(n, **options):
+    # The whole workload as one ProcessTable.
+    return ProcessTable.concat(generate_tables(n, **options))
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        description="Write a seeded synthetic workload as CSV/JSONL, in arrival order and in constant memory.")
+    parser.add_argument('n', type=int, help="number of processes")
+    parser.add_argument('-o', '--output', default='-', help="output file ('-' for stdout)")
+    parser.add_argument('--format', choices=FORMATS, help="defaults to the file extension, or csv for stdout")
+    parser.add_argument('--arrivals', choices=ARRIVALS, default='poisson')
+    parser.add_argument('--bursts', choices=BURSTS, default='exponential')
+    parser.add_argument('--burst-scale', type=float, default=10, help="mean burst time")
+    parser.add_argument('--load', type=float, default=0.9,
+                        help="offered load, mean burst over mean arrival gap")
+    parser.add_argument('--pareto-shape', type=float, default=1.5, help="tail index of pareto bursts")
+    parser.add_argument('--burst-size', type=float, default=8, help="mean processes per burst for bursty arrivals")
+    parser.add_argument('--zipf', type=float, default=1.2, help="Zipf exponent of the priorities")
+    parser.add_argument('--max-priority', type=int, default=10)
+    parser.add_argument('--seed', type=int, default=0)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    fmt = args.format or detect_format(args.output)
+    try:
+        tables = generate_tables(args.n, args.arrivals, args.bursts, args.burst_scale, args.load,
+                                 args.pareto_shape, args.burst_size, args.zipf, args.max_priority, args.seed)
+    except ValueError as e:
+        sys.exit(f"error: {e}")
+    with ExitStack() as stack:
+        out = sys.stdout if args.output == '-' else stack.enter_context(open(args.output, 'w', newline=''))
+        for i, table in enumerate(tables):
+            write_processes(out, table, fmt, header=i == 0)
+
+if __name__ == "__main__":
+    main()
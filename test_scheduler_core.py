@@ -0,0 +1,278 @@
+import random
+
+import pytest
+
+from scheduler_core import (
+    ALGORITHMS, MULTICORE_ALGORITHMS, Completion, IncrementalScheduler, ProcessTable, multicore_schedule, schedule,
+    stream_schedule
+)
+
+# The original tick-by-tick implementations, kept as the reference the
+# event-driven engines and vectorized FCFS must reproduce: same gantt
+# segments and same ST/CT per process. Ties go to the earlier arrival, then
+# to the earlier input position.
+
+def reference_fcfs(processes):
+    time, result, gantt = 0, {}, []
+    for p in sorted(processes, key=lambda p: p['AT']):
+        time = max(time, p['AT'])
+        result[p['PID']] = (time, time + p['BT'])
+        gantt.append((p['PID'], time, time + p['BT']))
+        time += p['BT']
+    return result, gantt
+
+def reference_non_preemptive(processes, key):
+    time, result, gantt = 0, {}, []
+    waiting = list(processes)
+    while waiting:
+        ready = [p for p in waiting if p['AT'] <= time]
+        if not ready:
+            time += 1
+            continue
+        p = min(ready, key=lambda p: (p[key], p['AT']))
+        waiting.remove(p)
+        result[p['PID']] = (time, time + p['BT'])
+        gantt.append((p['PID'], time, time + p['BT']))
+        time += p['BT']
+    return result, gantt
+
+def reference_preemptive(processes, by_priority):
+    remaining = {p['PID']: p['BT'] for p in processes}
+    start, finish, timeline = {}, {}, []
+    time = 0
+    while len(finish) < len(processes):
+        ready = [p for p in processes if p['AT'] <= time and remaining[p['PID']] > 0]
+        if not ready:
+            time += 1
+            continue
+        p = min(ready, key=lambda p: (p['Priority'] if by_priority else remaining[p['PID']], p['AT']))
+        start.setdefault(p['PID'], time)
+        if not timeline or timeline[-1][0] != p['PID']:
+            timeline.append((p['PID'], time))
+        remaining[p['PID']] -= 1
+        time += 1
+        if remaining[p['PID']] == 0:
+            finish[p['PID']] = time
+    timeline.append((None, time))
+    gantt = [(pid, begin, end) for (pid, begin), (_, end) in zip(timeline, timeline[1:])]
+    return {pid: (start[pid], finish[pid]) for pid in finish}, gantt
+
+def reference_round_robin(processes, quantum):
+    procs = sorted(processes, key=lambda p: p['AT'])
+    remaining = [p['BT'] for p in procs]
+    start, finish, gantt = {}, {}, []
+    queue, admitted, time = [], 0, 0
+
+    def admit(until):
+        nonlocal admitted
+        while admitted < len(procs) and procs[admitted]['AT'] <= until:
+            queue.append(admitted)
+            admitted += 1
+
+    admit(time)
+    while len(finish) < len(procs):
+        if not queue:
+            time += 1
+            admit(time)
+            continue
+        i = queue.pop(0)
+        pid = procs[i]['PID']
+        start.setdefault(pid, time)
+        run = min(quantum, remaining[i])
+        gantt.append((pid, time, time + run))
+        time += run
+        remaining[i] -= run
+        admit(time)
+        if remaining[i]:
+            queue.append(i)
+        else:
+            finish[pid] = time
+    return {pid: (start[pid], finish[pid]) for pid in finish}, gantt
+
+REFERENCES = {
+    'fcfs': reference_fcfs,
+    'sjf_non_preemptive': lambda processes: reference_non_preemptive(processes, 'BT'),
+    'srtf': lambda processes: reference_preemptive(processes, False),
+    'priority_non_preemptive': lambda processes: reference_non_preemptive(processes, 'Priority'),
+    'priority_preemptive': lambda processes: reference_preemptive(processes, True),
+    'round_robin': lambda processes: reference_round_robin(processes, 3),
+}
+
+def random_workload(seed):
+    rng = random.Random(seed)
+    n = rng.randint(1, 25)
+    # Few distinct values, so ties and idle gaps are common.
+    return [{'PID': pid, 'AT': rng.randint(0, 40), 'BT': rng.randint(1, 8), 'Priority': rng.randint(0, 4)}
+            for pid in range(1, n + 1)]
+
+def batch_results(table):
+    return {pid: (st, ct) for pid, st, ct in table.rows(['PID', 'ST', 'CT'])}
+
+@pytest.mark.parametrize('algorithm', list(REFERENCES))
+def test_engines_match_reference(algorithm):
+    for seed in range(200):
+        processes = random_workload(seed)
+        expected, expected_gantt = REFERENCES[algorithm](processes)
+        table, gantt = schedule(algorithm, ProcessTable.from_dicts(processes), quantum=3)
+        assert batch_results(table) == expected, seed
+        assert [tuple(segment) for segment in gantt] == expected_gantt, seed
+        assert (table['TAT'] == table['CT'] - table['AT']).all()
+        assert (table['WT'] == table['TAT'] - table['BT']).all()
+        assert (table['RT'] == table['ST'] - table['AT']).all()
+
+@pytest.mark.parametrize('algorithm', list(ALGORITHMS))
+def test_stream_schedule_matches_batch(algorithm):
+    for seed in range(200):
+        processes = random_workload(seed)
+        table, gantt = schedule(algorithm, ProcessTable.from_dicts(processes), quantum=3)
+        arrivals = sorted(processes, key=lambda p: p['AT'])
+        segments, results = [], {}
+        for event in stream_schedule(algorithm, arrivals, quantum=3):
+            if event.__class__ is Completion:
+                results[event.PID] = (event.ST, event.CT)
+            else:
+                segments.append(tuple(event))
+        assert results == batch_results(table), seed
+        assert segments == [tuple(segment) for segment in gantt], seed
+
+def test_stream_schedule_rejects_unsorted_arrivals():
+    with pytest.raises(ValueError):
+        list(stream_schedule('srtf', [(1, 5, 2, 0), (2, 3, 1, 0)]))
+
+def test_incremental_scheduler_matches_full_runs():
+    for algorithm in ALGORITHMS:
+        rng = random.Random(algorithm)
+        scheduler = IncrementalScheduler(algorithm, quantum=3)
+        # Checkpoint often, so edits resume from one instead of rerunning.
+        scheduler.MIN_CHECKPOINT_EVERY = 2
+        processes = random_workload(rng.randrange(1000))
+        next_pid = len(processes) + 1
+        resumed = 0
+        for _ in range(60):
+            change = rng.choice(('add', 'remove', 'edit'))
+            if change == 'add' or not processes:
+                processes.append({'PID': next_pid, 'AT': rng.randint(0, 40), 'BT': rng.randint(1, 8),
+                                  'Priority': rng.randint(0, 4)})
+                next_pid += 1
+            elif change == 'remove':
+                processes.pop(rng.randrange(len(processes)))
+            else:
+                rng.choice(processes)[rng.choice(('AT', 'BT', 'Priority'))] += rng.randint(1, 3)
+            table, gantt = scheduler.run(ProcessTable.from_dicts(processes))
+            expected, expected_gantt = schedule(algorithm, ProcessTable.from_dicts(processes), quantum=3)
+            assert batch_results(table) == batch_results(expected), algorithm
+            assert gantt == expected_gantt, algorithm
+            resumed += scheduler.resumed_at is not None
+        assert resumed, algorithm
+
+def reference_aging(processes, interval, cap, preemptive):
+    # Tick by tick: a process ranks at interval*Priority less the time it has
+    # waited, by at most interval*cap; the lowest rank runs, ties going to
+    # the earlier arrival. Without preemption a process runs to completion.
+    procs = sorted(processes, key=lambda p: p['AT'])
+    remaining = [p['BT'] for p in procs]
+    waited = [0] * len(procs)
+    start, finish, timeline, gantt = {}, {}, [], []
+    time, running = 0, None
+    while len(finish) < len(procs):
+        ready = [i for i, p in enumerate(procs) if p['AT'] <= time and remaining[i]]
+        if not ready:
+            time += 1
+            continue
+        if preemptive or running is None:
+            running = min(ready, key=lambda i: (interval * procs[i]['Priority'] - min(interval * cap, waited[i]), i))
+        pid = procs[running]['PID']
+        start.setdefault(pid, time)
+        if not timeline or timeline[-1][0] != pid:
+            timeline.append((pid, time))
+        for i in ready:
+            waited[i] += i != running
+        remaining[running] -= 1
+        time += 1
+        if not remaining[running]:
+            finish[pid] = time
+            gantt.append((pid, start[pid], time))
+            running = None
+    if preemptive:
+        timeline.append((None, time))
+        gantt = [(pid, begin, end) for (pid, begin), (_, end) in zip(timeline, timeline[1:])]
+    return {pid: (start[pid], finish[pid]) for pid in finish}, gantt
+
+@pytest.mark.parametrize('preemptive', [True, False])
+def test_priority_aging_matches_reference(preemptive):
+    for seed in range(200):
+        processes = random_workload(seed)
+        interval, cap = random.Random(seed).choice([(1, 1), (2, 3), (3, 10), (5, 2)])
+        expected, expected_gantt = reference_aging(processes, interval, cap, preemptive)
+        table, gantt = schedule('priority_aging', ProcessTable.from_dicts(processes), aging_interval=interval,
+                                aging_cap=cap, preemptive=preemptive)
+        assert batch_results(table) == expected, seed
+        assert [tuple(segment) for segment in gantt] == expected_gantt, seed
+
+@pytest.mark.parametrize('preemptive', [True, False])
+def test_priority_aging_without_cap_is_plain_priority(preemptive):
+    plain = 'priority_preemptive' if preemptive else 'priority_non_preemptive'
+    for seed in range(200):
+        processes = random_workload(seed)
+        table, gantt = schedule('priority_aging', ProcessTable.from_dicts(processes), aging_cap=0,
+                                preemptive=preemptive)
+        expected, expected_gantt = schedule(plain, ProcessTable.from_dicts(processes))
+        assert batch_results(table) == batch_results(expected), seed
+        assert gantt == expected_gantt, seed
+
+MULTICORE_OPTIONS = [{'queues': 'global'},
+                     {'queues': 'per_core', 'balance': 'least_loaded'},
+                     {'queues': 'per_core', 'balance': 'round_robin'},
+                     {'queues': 'per_core', 'balance': 'least_loaded', 'steal': False}]
+
+def absorb_idle(lane):
+    # A core lane in the single-CPU preemptive gantt's form, where a segment
+    # runs on to the next dispatch of a different PID.
+    merged = []
+    for pid, begin, end in lane:
+        if merged and merged[-1][0] == pid:
+            merged[-1] = (pid, merged[-1][1], end)
+        else:
+            if merged:
+                merged[-1] = (*merged[-1][:2], begin)
+            merged.append((pid, begin, end))
+    return merged
+
+@pytest.mark.parametrize('options', MULTICORE_OPTIONS)
+@pytest.mark.parametrize('algorithm', MULTICORE_ALGORITHMS)
+def test_one_core_is_single_core(algorithm, options):
+    for seed in range(100):
+        processes = random_workload(seed)
+        table, lanes = multicore_schedule(algorithm, ProcessTable.from_dicts(processes), 1, quantum=3, **options)
+        expected, gantt = schedule(algorithm, ProcessTable.from_dicts(processes), quantum=3)
+        assert batch_results(table) == batch_results(expected), seed
+        if algorithm in ('srtf', 'priority_preemptive'):
+            lanes = [absorb_idle(lane) for lane in lanes]
+        assert lanes == [gantt], seed
+
+@pytest.mark.parametrize('options', MULTICORE_OPTIONS)
+@pytest.mark.parametrize('algorithm', MULTICORE_ALGORITHMS)
+def test_multicore_invariants(algorithm, options):
+    for seed in range(100):
+        processes = random_workload(seed)
+        cores = random.Random(seed).randint(2, 4)
+        table, lanes = multicore_schedule(algorithm, ProcessTable.from_dicts(processes), cores, quantum=3,
+                                          **options)
+        assert len(lanes) == cores
+        runs = {}
+        for lane in lanes:
+            # A core runs one process at a time, and segments are never empty.
+            for (_, _, end), (_, begin, _) in zip(lane, lane[1:]):
+                assert end <= begin, seed
+            for pid, begin, end in lane:
+                assert begin < end, seed
+                runs.setdefault(pid, []).append((begin, end))
+        for pid, at, bt, st, ct in table.rows(['PID', 'AT', 'BT', 'ST', 'CT']):
+            spans = sorted(runs[pid])
+            # Each process runs for exactly its burst, from ST to CT, never
+            # before it arrives and never on two cores at once.
+            assert sum(end - begin for begin, end in spans) == bt, seed
+            assert at <= st == spans[0][0] and spans[-1][1] == ct, seed
+            for (_, end), (begin, _) in zip(spans, spans[1:]):
+                assert end <= begin, seed
+        assert (table['TAT'] == table['CT'] - table['AT']).all()
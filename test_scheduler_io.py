@@ -0,0 +1,60 @@
+import io
+
+import pytest
+
+from scheduler_io import import_processes
+
+def pids(table):
+    return table['PID'].tolist()
+
+def test_import_csv_reports_each_problem_by_line():
+    text = ("PID,AT,BT,Priority\n"
+            "1,0,5,1\n"
+            "2,-1,5,1\n"         # line 3
+            "\n"
+            "3,0,0,1\n"          # line 5
+            "4,0,2.5,1\n"        # line 6
+            "5,0,3,\n"           # line 7
+            "6,0,3\n"            # line 8
+            "\"7\",0,\"3\n\",1\n"  # lines 9-10, one record
+            "1,2,3,1\n"          # line 11
+            "8,0,4,2\n")
+    table, errors = import_processes(io.StringIO(text, newline=''), 'csv', priority=True, taken=[8])
+    assert pids(table) == [1, 7]
+    assert errors == [(3, "AT -1 must be >= 0"), (5, "BT 0 must be > 0"), (6, "BT '2.5' is not an integer"),
+                      (7, "no Priority"), (8, "3 fields, expected 4"), (11, "PID 1 repeats line 2"),
+                      (12, "PID 8 is already in use")]
+
+def test_import_jsonl_accepts_only_integers():
+    lines = ['{"PID": 1, "AT": 0, "BT": 2.5}',
+             '{"PID": 2, "AT": 0.9, "BT": 3}',
+             '',
+             '{"PID": 3, "AT": 0, "BT": true}',
+             'not json',
+             '[1, 2, 3]',
+             '{"PID": "6", "AT": "1", "BT": 3}',
+             '{"PID": 7, "AT": 0}']
+    table, errors = import_processes(io.StringIO('\n'.join(lines)), 'jsonl')
+    assert pids(table) == [6]
+    assert table['AT'].tolist() == [1]
+    assert errors == [(1, "BT 2.5 is not an integer"), (2, "AT 0.9 is not an integer"),
+                      (4, "BT True is not an integer"), (5, "not valid JSON"), (6, "not a JSON object"),
+                      (8, "no BT")]
+
+def test_import_ignores_priority_unless_asked():
+    table, errors = import_processes(io.StringIO("PID,AT,BT\n1,0,3\n"), 'csv')
+    assert pids(table) == [1] and not errors and not table.has_priority
+    with pytest.raises(ValueError, match="Priority"):
+        import_processes(io.StringIO("PID,AT,BT\n1,0,3\n"), 'csv', priority=True)
+
+@pytest.mark.parametrize('fmt', ['csv', 'jsonl'])
+def test_import_matches_across_chunks(fmt):
+    rows = [(pid, pid % 7 - 1, pid % 5) for pid in range(1, 50)] + [(3, 0, 1)]
+    if fmt == 'csv':
+        text = "PID,AT,BT\n" + "".join(f"{pid},{at},{bt}\n" for pid, at, bt in rows)
+    else:
+        text = "".join(f'{{"PID": {pid}, "AT": {at}, "BT": {bt}}}\n' for pid, at, bt in rows)
+    whole = import_processes(io.StringIO(text, newline=''), fmt)
+    chunked = import_processes(io.StringIO(text, newline=''), fmt, chunk_size=4)
+    assert pids(chunked[0]) == pids(whole[0])
+    assert chunked[1] == whole[1]